@@ -0,0 +1,88 @@
+import asyncio
+
+class AsyncBatcher:
+    """Coalesces concurrent awaiters on one event loop into predict_batch calls.
+
+    The first request opens a window of max_wait_ms; everything that arrives
+    before it closes (or until max_batch_size is reached) shares one batch,
+    which runs on the executor so the loop is never blocked.
+    """
+
+    def __init__(self, model, executor, max_batch_size=16, max_wait_ms=5):
+        self._model = model
+        self._executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()  # the loop only holds weak references to tasks
+
+    def submit(self, input_data):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((input_data, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # awaiters that were cancelled or timed out never reach the model
+        batch = [(data, future) for data, future in self._pending if not future.cancelled()]
+        self._pending = []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._executor, self._model.predict_batch,
+                                                 [data for data, _ in batch], len(batch))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+async def predict(batcher, input_data, timeout=None):
+    future = batcher.submit(input_data)
+    if timeout is None:
+        return await future
+    return await asyncio.wait_for(future, timeout)
+
+async def stream(batcher, inputs, window=None):
+    """Yields results for a sync or async iterable of inputs, in input order.
+
+    Up to `window` requests are in flight at once so the batcher always has
+    work queued while the caller consumes earlier results.
+    """
+    window = window or batcher.max_batch_size * 2
+    in_flight = []
+
+    async def items():
+        if hasattr(inputs, "__aiter__"):
+            async for item in inputs:
+                yield item
+        else:
+            for item in inputs:
+                yield item
+
+    try:
+        async for item in items():
+            in_flight.append(batcher.submit(item))
+            if len(in_flight) >= window:
+                yield await in_flight.pop(0)
+        while in_flight:
+            yield await in_flight.pop(0)
+    finally:
+        for future in in_flight:
+            future.cancel()
@@ -0,0 +1,146 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from models import TextClassifier, ImageClassifier
+from preprocess import prefetch_images
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif")
+
+def read_text_lines(path):
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if line:
+                yield number, line
+
+def read_jsonl(path, field):
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                record = json.loads(line)
+                yield record.get("id", number), record[field]
+
+def read_csv(path, field):
+    with open(path, newline="", encoding="utf-8") as f:
+        for number, row in enumerate(csv.DictReader(f), 1):
+            yield row.get("id", number), row[field]
+
+def walk_images(root):
+    # sorted walk so a resumed run sees the files in the same order
+    for folder, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(folder, name)
+                yield path, path
+
+def read_inputs(path, field="text"):
+    if os.path.isdir(path):
+        return walk_images(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".jsonl":
+        return read_jsonl(path, field)
+    if extension == ".csv":
+        return read_csv(path, field)
+    return read_text_lines(path)
+
+def batched(records, size):
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+class ResultWriter:
+    def __init__(self, path, append):
+        self._csv = path.lower().endswith(".csv")
+        write_header = not (append and os.path.exists(path))
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        if self._csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=["id", "label", "score"])
+            if write_header:
+                self._writer.writeheader()
+
+    def write(self, record_id, result):
+        if self._csv:
+            self._writer.writerow({"id": record_id, "label": result.label, "score": result.score})
+        else:
+            self._file.write(json.dumps({"id": record_id, **result.to_dict()}) + "\n")
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+def read_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)["done"]
+    except (OSError, ValueError, KeyError):
+        return 0
+
+def write_checkpoint(path, done):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"done": done}, f)
+    os.replace(tmp, path)
+
+def run(model, source, output, batch_size=32, field="text", checkpoint=None, resume=True, decode_workers=0):
+    checkpoint = checkpoint or output + ".ckpt"
+    done = read_checkpoint(checkpoint) if resume else 0
+    if done:
+        print(f"Resuming after {done} records")
+    writer = ResultWriter(output, append=done > 0)
+    try:
+        records = itertools.islice(read_inputs(source, field), done, None)
+        batches = batched(records, batch_size)
+        if decode_workers:
+            batches = prefetch_images(batches, size=model.input_size(), workers=decode_workers)
+        for batch in batches:
+            results = model.predict_batch([data for _, data in batch], batch_size=batch_size)
+            for (record_id, _), result in zip(batch, results):
+                writer.write(record_id, result)
+            # results hit the disk before the checkpoint moves past them
+            writer.flush()
+            done += len(batch)
+            write_checkpoint(checkpoint, done)
+    finally:
+        writer.close()
+    print(f"Classified {done} records into {output}")
+    return done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify a text file, JSONL/CSV file or image directory in batches.")
+    parser.add_argument("source", help="text/JSONL/CSV file, or a directory of images")
+    parser.add_argument("output", help="results file (.jsonl or .csv)")
+    parser.add_argument("--model", choices=["text", "image"], default=None,
+                        help="defaults to image for directories, text otherwise")
+    parser.add_argument("--model-name", default=None)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--field", default="text", help="JSONL/CSV column holding the input")
+    parser.add_argument("--precision", default="fp32")
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--top-k", type=int, default=1, help="labels kept per input (JSONL output only)")
+    parser.add_argument("--decode-workers", type=int, default=4,
+                        help="threads decoding images ahead of the model (0 decodes inline)")
+    parser.add_argument("--checkpoint", default=None, help="defaults to <output>.ckpt")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    kind = args.model or ("image" if os.path.isdir(args.source) else "text")
+    model_class = ImageClassifier if kind == "image" else TextClassifier
+    kwargs = {"precision": args.precision, "backend": args.backend, "top_k": args.top_k}
+    if args.model_name:
+        kwargs["model_name"] = args.model_name
+    run(model_class(**kwargs), args.source, args.output, args.batch_size, args.field,
+        args.checkpoint, resume=not args.restart,
+        decode_workers=args.decode_workers if kind == "image" else 0)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from models import TextClassifier, ImageClassifier, padding_stats
+from registry import ModelRegistry, current_rss
+
+DEFAULT_OUTPUT = "bench_output.txt"
+# tiny randomly initialised checkpoints: fast to load and enough to exercise the code paths
+TINY_TEXT_MODEL = "hf-internal-testing/tiny-random-DistilBertForSequenceClassification"
+TINY_IMAGE_MODEL = "hf-internal-testing/tiny-random-ViTForImageClassification"
+
+_WORDS = ("the movie was a fantastic and moving story with great acting but the plot "
+          "felt dull slow and predictable while the soundtrack was wonderful").split()
+
+def text_corpus(size=256, seed=137):
+    rng = random.Random(seed)
+    # mix of tweet-length and paragraph-length inputs
+    return [" ".join(rng.choice(_WORDS) for _ in range(rng.choice((6, 12, 24, 64, 160))))
+            for _ in range(size)]
+
+def image_corpus(size=64, seed=137, side=224):
+    from PIL import Image
+    rng = random.Random(seed)
+    return [Image.frombytes("RGB", (side, side), bytes(rng.getrandbits(8) for _ in range(side * side * 3)))
+            for _ in range(size)]
+
+def _percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))]
+
+def run_case(model_class, model_name, corpus, batch_size, threads, precision, backend, repeats=2):
+    import torch
+    torch.set_num_threads(threads)
+    # fresh registry: every case pays its own cold start
+    model = model_class(model_name=model_name, precision=precision, backend=backend, registry=ModelRegistry())
+    start = time.perf_counter()
+    model.load()
+    load_s = time.perf_counter() - start
+    model.predict_batch(corpus[:batch_size], batch_size=batch_size)  # warm-up
+    latencies = []
+    peak_rss = current_rss()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for offset in range(0, len(corpus), batch_size):
+            batch_start = time.perf_counter()
+            model.predict_batch(corpus[offset:offset + batch_size], batch_size=batch_size)
+            latencies.append(time.perf_counter() - batch_start)
+            peak_rss = max(peak_rss, current_rss())
+    elapsed = time.perf_counter() - start
+    model.unload()
+    latencies.sort()
+    return {
+        "model": model_class.__name__, "batch_size": batch_size, "threads": threads,
+        "precision": precision, "backend": backend,
+        "items_per_s": repeats * len(corpus) / elapsed,
+        "batch_p50_ms": _percentile(latencies, 50) * 1000,
+        "batch_p95_ms": _percentile(latencies, 95) * 1000,
+        "batch_p99_ms": _percentile(latencies, 99) * 1000,
+        "peak_rss_mb": peak_rss / (1024 * 1024),
+        "cold_load_s": load_s,
+    }
+
+def case_key(case):
+    return f"{case['model']}|bs={case['batch_size']}|t={case['threads']}|{case['precision']}|{case['backend']}"
+
+def compare(results, baseline, tolerance=0.10):
+    """Returns a list of human readable regressions against a stored baseline."""
+    previous = {case_key(case): case for case in baseline["results"]}
+    regressions = []
+    for case in results:
+        old = previous.get(case_key(case))
+        if old is None:
+            continue
+        if case["items_per_s"] < old["items_per_s"] * (1 - tolerance):
+            regressions.append(f"{case_key(case)}: throughput {old['items_per_s']:.1f} -> {case['items_per_s']:.1f} items/s")
+        if case["batch_p99_ms"] > old["batch_p99_ms"] * (1 + tolerance):
+            regressions.append(f"{case_key(case)}: p99 {old['batch_p99_ms']:.1f} -> {case['batch_p99_ms']:.1f} ms")
+    return regressions
+
+def compare_bucketing(model_name, corpus, batch_size=32, repeats=2):
+    """Naive vs length-bucketed batching of a mixed-length corpus: padding ratio and throughput."""
+    reports = {}
+    for bucketing in (False, True):
+        model = TextClassifier(model_name=model_name, length_bucketing=bucketing, registry=ModelRegistry())
+        model.load()
+        model.predict_batch(corpus[:batch_size], batch_size=batch_size)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model.predict_batch(corpus, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        if bucketing:
+            stats = model.padding_stats
+        else:
+            lengths = model.token_lengths(corpus)
+            stats = padding_stats([lengths[i:i + batch_size] for i in range(0, len(lengths), batch_size)])
+        model.unload()
+        reports["bucketed" if bucketing else "naive"] = dict(stats, items_per_s=repeats * len(corpus) / elapsed)
+    reports["speedup"] = reports["bucketed"]["items_per_s"] / reports["naive"]["items_per_s"]
+    return reports
+
+def compare_ingestion(model_name, image_path, repeats=20):
+    """Latency and Python-level allocations per predict for each way of handing ImageClassifier an image."""
+    import numpy as np
+    from PIL import Image
+    model = ImageClassifier(model_name=model_name, registry=ModelRegistry())
+    model.load()
+    with open(image_path, "rb") as f:
+        encoded = f.read()
+    pixels = np.asarray(Image.open(image_path).convert("RGB"))
+    raw = os.path.join(tempfile.mkdtemp(), "frame.raw")
+    pixels.tofile(raw)
+    inputs = {
+        "path": image_path,
+        "encoded_bytes": encoded,
+        "raw_memoryview": ImageClassifier.frame(memoryview(pixels.tobytes()), pixels.shape),
+        "numpy_array": pixels,
+        "memmap": ImageClassifier.open_raw(raw, pixels.shape),
+    }
+    reports = {}
+    for name, image in inputs.items():
+        model.predict_batch([image])  # warm-up
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model.predict_batch([image])
+        elapsed = time.perf_counter() - start
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        allocations = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+        reports[name] = {"latency_ms": elapsed / repeats * 1000, "live_allocations": allocations,
+                         "peak_traced_kb": peak / 1024}
+    model.unload()
+    return reports
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the classifiers over a fixed corpus.")
+    parser.add_argument("--text-model", default=TINY_TEXT_MODEL)
+    parser.add_argument("--image-model", default=TINY_IMAGE_MODEL)
+    parser.add_argument("--models", nargs="+", choices=["text", "image"], default=["text", "image"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 4])
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8"])
+    parser.add_argument("--backends", nargs="+", default=["torch"])
+    parser.add_argument("--bucketing", action="store_true",
+                        help="also compare naive vs length-bucketed text batching")
+    parser.add_argument("--ingestion", metavar="IMAGE",
+                        help="also compare path / bytes / array / memmap image inputs using this image")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    suites = {"text": (TextClassifier, args.text_model, text_corpus),
+              "image": (ImageClassifier, args.image_model, image_corpus)}
+    results = []
+    for kind in args.models:
+        model_class, model_name, make_corpus = suites[kind]
+        corpus = make_corpus()
+        for backend in args.backends:
+            for precision in args.precisions:
+                for threads in args.threads:
+                    for batch_size in args.batch_sizes:
+                        case = run_case(model_class, model_name, corpus, batch_size, threads, precision, backend)
+                        print(f"{case_key(case)}: {case['items_per_s']:.1f} items/s, "
+                              f"p99 {case['batch_p99_ms']:.1f} ms, load {case['cold_load_s']:.2f} s")
+                        results.append(case)
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    if args.bucketing:
+        report["bucketing"] = compare_bucketing(args.text_model, text_corpus(), max(args.batch_sizes))
+        naive, bucketed = report["bucketing"]["naive"], report["bucketing"]["bucketed"]
+        print(f"padding ratio {naive['padding_ratio']:.1%} -> {bucketed['padding_ratio']:.1%}, "
+              f"throughput {report['bucketing']['speedup']:.2f}x")
+    if args.ingestion:
+        report["ingestion"] = compare_ingestion(args.image_model, args.ingestion)
+        for name, stats in report["ingestion"].items():
+            print(f"{name:<16} {stats['latency_ms']:8.2f} ms  {stats['live_allocations']:6d} allocations  "
+                  f"peak {stats['peak_traced_kb']:.0f} KB")
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} cases to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
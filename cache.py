@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_DISK_PATH = os.path.join(os.path.expanduser("~"), ".cache", "hit137", "predictions.sqlite")
+
+class PredictionCache:
+    """LRU + TTL cache of prediction results keyed by model and input content.
+
+    Entries live in a bounded in-memory OrderedDict; when disk_path is given
+    they are also written to a sqlite file so hits survive restarts.
+    """
+
+    def __init__(self, max_entries=1024, ttl=24 * 3600, disk_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS predictions "
+                             "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model_name, input_data, paths=False):
+        # paths=True: a string naming an existing file is keyed by the file's contents
+        digest = hashlib.sha256()
+        if paths and isinstance(input_data, str) and os.path.isfile(input_data):
+            with open(input_data, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        elif isinstance(input_data, str):
+            digest.update(" ".join(input_data.split()).encode("utf-8"))
+        elif isinstance(input_data, (bytes, bytearray, memoryview)):
+            digest.update(input_data)
+        elif hasattr(input_data, "ndim") and hasattr(input_data, "dtype"):
+            # numpy array / memmap: hash the buffer in place when it is contiguous
+            digest.update(f"{input_data.dtype}{input_data.shape}".encode("utf-8"))
+            digest.update(memoryview(input_data) if input_data.flags.c_contiguous else input_data.tobytes())
+        elif hasattr(input_data, "tobytes") and hasattr(input_data, "mode"):
+            # PIL image: hash the decoded pixels along with their layout
+            digest.update(f"{input_data.mode}{input_data.size}".encode("utf-8"))
+            digest.update(input_data.tobytes())
+        else:
+            raise TypeError(f"Cannot build a cache key for {type(input_data).__name__}")
+        return f"{model_name}:{digest.hexdigest()}"
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT value, created FROM predictions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (json.loads(row[0]), row[1])
+                    self._store(key, entry)
+            if entry is not None and now - entry[1] > self.ttl:
+                self._evict(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        entry = (value, time.time())
+        with self._lock:
+            self._store(key, entry)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)",
+                                 (key, json.dumps(value), entry[1]))
+                self._db.commit()
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _evict(self, key):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM predictions WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM predictions")
+                self._db.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,91 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+
+MODEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hit137", "models")
+# everything a pipeline needs; skips duplicate .bin/.h5/.msgpack weights when safetensors exist
+_ALLOW_PATTERNS = ["*.json", "*.txt", "*.model", "*.safetensors"]
+
+@contextmanager
+def _phase(phases, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = time.perf_counter() - start
+
+def local_path(model_name, cache_dir=MODEL_CACHE_DIR):
+    """Local directory for model_name if it is already on disk, else None; never touches the network."""
+    if os.path.isdir(model_name):
+        return model_name
+    from huggingface_hub import snapshot_download
+    try:
+        return snapshot_download(model_name, cache_dir=cache_dir, local_files_only=True)
+    except Exception:
+        return None
+
+def resolve(model_name, cache_dir=MODEL_CACHE_DIR):
+    """Returns a local directory for model_name, hitting the network only on the very first run."""
+    path = local_path(model_name, cache_dir)
+    if path is not None:
+        return path
+    from huggingface_hub import snapshot_download
+    print(f"[FASTLOAD] {model_name} not cached yet, downloading once to {cache_dir}")
+    path = snapshot_download(model_name, cache_dir=cache_dir, allow_patterns=_ALLOW_PATTERNS)
+    if not any(name.endswith(".safetensors") for name in os.listdir(path)):
+        # older repos only ship pytorch_model.bin
+        path = snapshot_download(model_name, cache_dir=cache_dir, allow_patterns=_ALLOW_PATTERNS + ["*.bin"])
+    return path
+
+def _load_tokenizer(path, model_name, cache_dir):
+    from transformers import AutoTokenizer
+    if os.path.exists(os.path.join(path, "tokenizer.json")):
+        return AutoTokenizer.from_pretrained(path)
+    # no serialized fast tokenizer in the checkpoint: build it once from the vocab and keep tokenizer.json
+    saved = os.path.join(cache_dir, "tokenizers", re.sub(r"[^\w.-]", "_", model_name))
+    if os.path.exists(os.path.join(saved, "tokenizer.json")):
+        return AutoTokenizer.from_pretrained(saved)
+    tokenizer = AutoTokenizer.from_pretrained(path)
+    tokenizer.save_pretrained(saved)
+    return tokenizer
+
+def build_pipeline(task, model_name, device="cpu", precision="fp32", cache_dir=MODEL_CACHE_DIR):
+    """Builds a transformers pipeline from the local cache and records how long each phase took.
+
+    safetensors weights are memory-mapped by from_pretrained, and low_cpu_mem_usage
+    skips the random initialisation that would otherwise be overwritten.
+    """
+    import torch
+    from transformers import (AutoConfig, AutoImageProcessor, AutoModelForImageClassification,
+                              AutoModelForSequenceClassification, pipeline)
+    phases = {}
+    with _phase(phases, "resolve"):
+        path = resolve(model_name, cache_dir)
+    with _phase(phases, "config"):
+        config = AutoConfig.from_pretrained(path)
+    kwargs = {}
+    if task == "text-classification":
+        model_class = AutoModelForSequenceClassification
+        with _phase(phases, "tokenizer"):
+            kwargs["tokenizer"] = _load_tokenizer(path, model_name, cache_dir)
+    elif task == "image-classification":
+        model_class = AutoModelForImageClassification
+        with _phase(phases, "processor"):
+            kwargs["image_processor"] = AutoImageProcessor.from_pretrained(path)
+    else:
+        raise ValueError(f"Fast loading does not support task {task!r}")
+    use_safetensors = any(name.endswith(".safetensors") for name in os.listdir(path))
+    with _phase(phases, "weights"):
+        model = model_class.from_pretrained(path, config=config, use_safetensors=use_safetensors,
+                                            low_cpu_mem_usage=True,
+                                            torch_dtype=torch.bfloat16 if precision == "bf16" else None)
+    if precision == "int8":
+        with _phase(phases, "quantize"):
+            # dynamic quantization: Linear weights stored as int8, activations quantized per batch
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    with _phase(phases, "pipeline"):
+        pipe = pipeline(task, model=model, device=device, **kwargs)
+    pipe.load_phases = phases
+    print("[FASTLOAD] " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in phases.items()))
+    return pipe
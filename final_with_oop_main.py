@@ -29,8 +29,8 @@ How we used it:
 Method overriding redefines inherited methods in child classes with different implementations.
 
 How we used it:
-- TextClassifier and ImageClassifier both implement predict() differently
-- Text handles text input, Image handles image paths
+- TextClassifier and ImageClassifier both implement describe() differently
+- Text reports a sentiment, Image a predicted class
 - Same method name, different functionality based on data type
 
 5. Polymorphism
@@ -44,81 +44,52 @@ How we used it:
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import threading
+import itertools
 import os
 import time
-import functools
-from transformers import pipeline
-from PIL import Image
-import torch
-
-def measure_time(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        print(f"TIMER {func.__name__} took {end-start:.2f}s")
-        return result
-    return wrapper
-
-def log_call(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        model_name = getattr(args[0], '_model_name', 'unknown') if args else 'unknown'
-        print(f"LOG Calling {func.__name__} on {model_name}")
-        return func(*args, **kwargs)
-    return wrapper
-
-class TextClassifier:
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from models import TextClassifier as BaseTextClassifier, ImageClassifier as BaseImageClassifier, prewarm, get_executor
+from cache import PredictionCache, DEFAULT_DISK_PATH
+from registry import REGISTRY
+import runtime
+
+# shared across both classifiers; the sqlite tier keeps hits between runs of the GUI
+PREDICTION_CACHE = PredictionCache(max_entries=512, disk_path=DEFAULT_DISK_PATH)
+LOAD_WORKERS = 4
+
+class TextClassifier(BaseTextClassifier):
     def __init__(self, model_name="distilbert-base-uncased-finetuned-sst-2-english"):
-        self._model_name = model_name
-        self._pipeline = None
-        self._loaded = False
+        super().__init__(model_name, cache=PREDICTION_CACHE)
 
     def load(self):
         try:
             print(f"Loading {self._model_name}...")
-            self._pipeline = pipeline("text-classification", model=self._model_name)
-            self._loaded = True
+            super().load()
             print(f"Successfully loaded {self._model_name}")
             return True
         except Exception as e:
             print(f"Error loading {self._model_name}: {str(e)}")
             raise e
 
-    @measure_time
-    @log_call
-    def predict(self, text):
-        if not self._loaded:
-            self.load()
-        result = self._pipeline(text)[0]
-        return f"Sentiment: {result['label']}\nConfidence: {result['score']:.4f}"
+    def describe(self, result):
+        return f"Sentiment: {result.label}\nConfidence: {result.score:.4f}"
 
-class ImageClassifier:
+class ImageClassifier(BaseImageClassifier):
     def __init__(self, model_name="google/vit-base-patch16-224"):
-        self._model_name = model_name
-        self._pipeline = None
-        self._loaded = False
+        super().__init__(model_name, cache=PREDICTION_CACHE)
 
     def load(self):
         try:
             print(f"Loading {self._model_name}...")
-            self._pipeline = pipeline("image-classification", model=self._model_name)
-            self._loaded = True
+            super().load()
             print(f"Successfully loaded {self._model_name}")
             return True
         except Exception as e:
             print(f"Error loading {self._model_name}: {str(e)}")
             raise e
 
-    @measure_time
-    @log_call
-    def predict(self, image_path):
-        if not self._loaded:
-            self.load()
-        result = self._pipeline(image_path)[0]
-        return f"Prediction: {result['label']}\nConfidence: {result['score']:.4f}"
+    def describe(self, result):
+        return f"Prediction: {result.label}\nConfidence: {result.score:.4f}"
 
 class AIGUI:
     def __init__(self, root):
@@ -134,6 +105,7 @@ class AIGUI:
         self.current_model = None
         self.model_instances = {}
         self.is_loading = False
+        self.executor = get_executor()
 
         self.create_menu()
         self.create_frames()
@@ -149,6 +121,7 @@ class AIGUI:
         models_menu = tk.Menu(menubar, tearoff=0)
         models_menu.add_command(label="Load Selected Model", command=self.load_selected_model)
         models_menu.add_command(label="Load All Models", command=self.load_all_models)
+        models_menu.add_command(label="Export Stage Trace...", command=self.export_trace)
         menubar.add_cascade(label="Models", menu=models_menu)
 
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -314,7 +287,7 @@ OOP Concepts Implemented:
         def load_model_thread():
             try:
                 model_class = self.model_classes[selected]
-                model_instance = model_class()
+                model_instance = self.model_instances.get(selected) or model_class()
                 model_instance.load()
                 
                 self.model_instances[selected] = model_instance
@@ -325,17 +298,18 @@ OOP Concepts Implemented:
             except Exception as e:
                 self.root.after(0, lambda: self.on_model_load_error(selected, str(e)))
         
-        threading.Thread(target=load_model_thread, daemon=True).start()
+        self.executor.submit(load_model_thread)
 
     def on_model_loaded(self, model_name, model_instance):
         self.is_loading = False
         self.load_btn.config(state="normal")
-        self.status_label.config(text=f"{model_name} loaded successfully!")
+        self.status_label.config(text=f"{model_name} loaded successfully! {REGISTRY.resident_summary()}")
         
         info = f"MODEL LOADED SUCCESSFULLY!\n\n"
         info += f"Name: {model_name}\n"
         info += f"Model ID: {model_instance._model_name}\n"
-        info += f"Status: Ready for predictions!"
+        info += f"Status: Ready for predictions!\n\n"
+        info += f"Load time by phase:\n{model_instance.load_report()}"
         
         self.model_info_text.delete("1.0", tk.END)
         self.model_info_text.insert("1.0", info)
@@ -357,27 +331,46 @@ OOP Concepts Implemented:
         self.model_info_text.delete("1.0", tk.END)
         self.model_info_text.insert("1.0", "Loading all models...\nThis may take a few minutes...\n\n")
         
+        def load_one(name, model_class):
+            self.root.after(0, lambda: self.model_info_text.insert(tk.END, f"Loading {name}...\n"))
+            start = time.perf_counter()
+            model_instance = model_class()
+            model_instance.load()
+            self.model_instances[name] = model_instance  # only once loaded, so a failed load is retried
+            elapsed = time.perf_counter() - start
+            self.root.after(0, lambda: self.model_info_text.insert(tk.END, f"{name} ready in {elapsed:.1f}s\n"))
+            return elapsed
+
         def load_all_thread():
             results = []
-            for name, model_class in self.model_classes.items():
-                try:
-                    if name not in self.model_instances:
-                        self.root.after(0, lambda n=name: self.model_info_text.insert(tk.END, f"Loading {n}...\n"))
-                        model_instance = model_class()
-                        model_instance.load()
-                        self.model_instances[name] = model_instance
-                        results.append(f"{name}: Loaded successfully")
-                    else:
-                        results.append(f"{name}: Already loaded")
-                except Exception as e:
-                    results.append(f"{name}: Failed - {str(e)}")
+            summed = 0.0
+            start = time.perf_counter()
+            pending = {name: model_class for name, model_class in self.model_classes.items()
+                       if name not in self.model_instances}
+            results.extend(f"{name}: Already loaded" for name in self.model_classes if name not in pending)
+            # the registry locks per model, so different models can load side by side
+            with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as pool:
+                futures = {pool.submit(load_one, name, model_class): name for name, model_class in pending.items()}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        elapsed = future.result()
+                        summed += elapsed
+                        results.append(f"{name}: Loaded successfully in {elapsed:.1f}s")
+                    except Exception as e:
+                        self.root.after(0, lambda n=name: self.model_info_text.insert(tk.END, f"{n} failed\n"))
+                        results.append(f"{name}: Failed - {str(e)}")
+            wall = time.perf_counter() - start
+            if pending:
+                # per-model times overlap and compete for cores, so their sum is not a sequential baseline
+                results.append(f"\nWall clock: {wall:.1f}s ({summed:.1f}s summed across concurrent loads)")
             
             self.root.after(0, lambda: self.on_all_models_loaded(results))
         
-        threading.Thread(target=load_all_thread, daemon=True).start()
+        self.executor.submit(load_all_thread)
 
     def on_all_models_loaded(self, results):
-        self.status_label.config(text="All models loaded!")
+        self.status_label.config(text=f"All models loaded! {REGISTRY.resident_summary()}")
         self.model_info_text.delete("1.0", tk.END)
         self.model_info_text.insert("1.0", "ALL MODELS STATUS:\n\n" + "\n".join(results))
         messagebox.showinfo("All Models Loaded", "All models have been loaded successfully!")
@@ -403,16 +396,21 @@ OOP Concepts Implemented:
         
         def run_model_thread():
             try:
-                result = self.current_model.predict(input_data)
+                result = self.current_model.describe(self.current_model.predict(input_data))
                 model_name = self.model_var.get()
                 self.root.after(0, lambda: self.on_model_result(model_name, result))
             except Exception as e:
                 self.root.after(0, lambda: self.on_model_error(str(e)))
         
-        threading.Thread(target=run_model_thread, daemon=True).start()
+        self.executor.submit(run_model_thread)
 
     def on_model_result(self, model_name, result):
         self.run_selected_btn.config(state="normal")
+        self.status_label.config(text=REGISTRY.resident_summary())
+        trace = self.current_model.last_trace
+        if trace is not None:
+            self.model_info_text.delete("1.0", tk.END)
+            self.model_info_text.insert("1.0", f"Model ID: {self.current_model.model_name}\n\n{trace.summary()}")
         self.output_text.delete("1.0", tk.END)
         self.output_text.insert("1.0", f"{model_name} RESULTS:\n{'='*40}\n{result}\n\n")
         self.output_text.insert(tk.END, f"\nPrediction completed successfully!")
@@ -434,41 +432,70 @@ OOP Concepts Implemented:
                 messagebox.showerror("Invalid Image", "Please select a valid image file using the Browse button!")
                 return
         
+        modality = self.input_type.get().lower()
+        compatible = {name: model_class for name, model_class in self.model_classes.items()
+                      if model_class.modality == modality}
+        if not compatible:
+            messagebox.showwarning("No Compatible Model", f"No model accepts {modality} input!")
+            return
+        
         self.output_text.delete("1.0", tk.END)
-        self.output_text.insert("1.0", "Running all models...\nPlease wait...\n\n")
+        self.output_text.insert("1.0", f"Running {len(compatible)} {modality} model(s)...\n\n")
         self.run_all_btn.config(state="disabled")
         
+        # saved calibration profiles win; otherwise split the cores so concurrent models don't oversubscribe
+        workers = min(len(compatible), LOAD_WORKERS)
+        shares = itertools.cycle(runtime.split_cpus(workers))
+        profiles = {name: runtime.profile_for(model_class().model_name) or next(shares)
+                    for name, model_class in compatible.items()}
+
+        def run_one(name, model_class):
+            start = time.perf_counter()
+            try:
+                with runtime.applied(profiles[name]):
+                    model_instance = self.model_instances.get(name) or model_class()
+                    model_instance.load()
+                    self.model_instances[name] = model_instance
+                    result, error = model_instance.describe(model_instance.predict(input_data)), None
+            except Exception as e:
+                result, error = None, str(e)
+            elapsed = time.perf_counter() - start
+            # stream each model's output as soon as it is ready
+            self.root.after(0, lambda: self.on_single_model_result(name, result, error, elapsed))
+            return elapsed
+
         def run_all_models_thread():
-            results = []
-            for name, model_class in self.model_classes.items():
-                try:
-                    if name not in self.model_instances:
-                        model_instance = model_class()
-                        model_instance.load()
-                        self.model_instances[name] = model_instance
-                    
-                    model_instance = self.model_instances[name]
-                    result = model_instance.predict(input_data)
-                    results.append((name, result, None))
-                except Exception as e:
-                    results.append((name, None, str(e)))
-            
-            self.root.after(0, lambda: self.on_all_models_result(results))
-        
-        threading.Thread(target=run_all_models_thread, daemon=True).start()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                elapsed = list(pool.map(lambda item: run_one(*item), compatible.items()))
+            wall = time.perf_counter() - start
+            self.root.after(0, lambda: self.on_all_models_result(wall, sum(elapsed)))
+        
+        self.executor.submit(run_all_models_thread)
+
+    def on_single_model_result(self, name, result, error, elapsed):
+        self.output_text.insert(tk.END, f"{name} ({elapsed:.2f}s):\n")
+        self.output_text.insert(tk.END, "=" * 50 + "\n")
+        if error:
+            self.output_text.insert(tk.END, f"Error: {error}\n")
+        else:
+            self.output_text.insert(tk.END, f"{result}\n")
+        self.output_text.insert(tk.END, "\n")
 
-    def on_all_models_result(self, results):
+    def on_all_models_result(self, wall, sequential):
         self.run_all_btn.config(state="normal")
-        self.output_text.delete("1.0", tk.END)
-        
-        for name, result, error in results:
-            self.output_text.insert(tk.END, f"{name}:\n")
-            self.output_text.insert(tk.END, "=" * 50 + "\n")
-            if error:
-                self.output_text.insert(tk.END, f"Error: {error}\n")
-            else:
-                self.output_text.insert(tk.END, f"{result}\n")
-            self.output_text.insert(tk.END, "\n")
+        self.status_label.config(text=REGISTRY.resident_summary())
+        self.output_text.insert(tk.END, f"All done in {wall:.2f}s (models took {sequential:.2f}s combined)\n")
+
+    def export_trace(self):
+        if not self.current_model or not self.current_model.traces:
+            messagebox.showwarning("No Trace", "Run a model first to record a stage trace!")
+            return
+        path = filedialog.asksaveasfilename(title="Export Chrome Trace", defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            count = self.current_model.export_chrome_trace(path)
+            self.status_label.config(text=f"Exported {count} trace events to {path} (open in chrome://tracing)")
 
     def clear_output(self):
         self.output_text.delete("1.0", tk.END)
@@ -503,6 +530,7 @@ Built with Python and Transformers"""
 if __name__ == "__main__":
     root = tk.Tk()
     app = AIGUI(root)
+    root.after(0, prewarm)
     
     print("AI Model GUI Starting...")
     print("Models will download on first use (requires internet)")
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from models import TextClassifier, ImageClassifier
+from models import TextClassifier, ImageClassifier, prewarm
+from results import format_prediction
 
 class AIGUI:
     def __init__(self, root):
@@ -97,13 +98,13 @@ class AIGUI:
         if model:
             inp = self.input_text.get("1.0", tk.END).strip()
             if inp:
-                self.output_text.insert(tk.END, f"{selected} Output:\n{model.predict(inp)}\n\n")
+                self.output_text.insert(tk.END, f"{selected} Output:\n{format_prediction(model.predict(inp))}\n\n")
 
     def run_all_models(self):
         inp = self.input_text.get("1.0", tk.END).strip()
         if inp:
             for name, model in self.models.items():
-                self.output_text.insert(tk.END, f"{name} Output:\n{model.predict(inp)}\n\n")
+                self.output_text.insert(tk.END, f"{name} Output:\n{format_prediction(model.predict(inp))}\n\n")
 
     def browse_file(self):
         file_path = filedialog.askopenfilename()
@@ -118,4 +119,5 @@ class AIGUI:
 if __name__ == "__main__":
     root = tk.Tk()
     app = AIGUI(root)
+    root.after(0, prewarm)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,60 @@
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+def run(url, payload, concurrency=8, duration=10.0):
+    body = json.dumps(payload).encode("utf-8")
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        while time.perf_counter() < deadline:
+            request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            except urllib.error.URLError:
+                status = "error"
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    report = {"concurrency": concurrency, "seconds": elapsed, "statuses": statuses,
+              "ok_rps": len(latencies) / elapsed}
+    if latencies:
+        report["p50_ms"] = latencies[len(latencies) // 2] * 1000
+        report["p99_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure requests per second against server.py.")
+    parser.add_argument("--url", default="http://127.0.0.1:8137/v1/text")
+    parser.add_argument("--text", default="This is a fantastic movie! I loved every moment of it.")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args(argv)
+    for concurrency in args.concurrency:
+        report = run(args.url, {"text": args.text}, concurrency, args.duration)
+        latency = f", p50 {report['p50_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms" if "p50_ms" in report else ""
+        print(f"concurrency {concurrency}: {report['ok_rps']:.1f} req/s{latency}, statuses {report['statuses']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,21 @@
-from transformers import pipeline
+from models import ImageClassifier
 '''
-pipe = pipeline("text-classification", model="distilbert/distilbert-base-uncased-finetuned-sst-2-english")
+model = TextClassifier()
 
 while True:
     user_input = input("Enter your text: ")
     if user_input.lower() == 'quit':
         break
-    result = pipe(user_input)
+    result = model.predict(user_input)
     print("Result:", result)
  '''
 
-pipe = pipeline("image-classification", model="google/vit-base-patch16-224")
+model = ImageClassifier()
 image_path = input("Enter image filename: ")
-result = pipe(image_path)
+best_guess = model.predict_batch([image_path])[0]
 
-best_guess = result[0]
-label = best_guess['label']
-confidence = best_guess['score'] * 100
+label = best_guess.label
+confidence = best_guess.score * 100
 
 clean_output = f"{label} ({confidence:.1f}% confidence)"
-print(clean_output)
\ No newline at end of file
+print(clean_output)
@@ -0,0 +1,128 @@
+import os
+import threading
+
+# flip to False (or set HIT137_METRICS=0) to make the decorators a straight pass-through
+ENABLED = os.environ.get("HIT137_METRICS", "1") != "0"
+
+_SUB_BUCKET_BITS = 5  # keeps the top 5 bits: 16 linear sub-buckets per power of two, ~6% error
+
+class Histogram:
+    """HDR-style log-linear histogram of integer nanosecond values."""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(value):
+        bits = value.bit_length()
+        if bits <= _SUB_BUCKET_BITS:
+            return value
+        shift = bits - _SUB_BUCKET_BITS
+        return (shift << _SUB_BUCKET_BITS) + (value >> shift)
+
+    @staticmethod
+    def _upper(index):
+        shift, sub = divmod(index, 1 << _SUB_BUCKET_BITS)
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value):
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct):
+        if not self.count:
+            return 0
+        target = pct / 100 * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper(index), self.max)
+        return self.max
+
+class _Series:
+    __slots__ = ("histogram", "calls", "errors", "in_flight")
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+
+class MetricsRegistry:
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _get(self, model, method):
+        series = self._series.get((model, method))
+        if series is None:
+            series = self._series.setdefault((model, method), _Series())
+        return series
+
+    def record_time(self, model, method, elapsed_ns):
+        with self._lock:
+            self._get(model, method).histogram.record(elapsed_ns)
+
+    def call_started(self, model, method):
+        with self._lock:
+            series = self._get(model, method)
+            series.calls += 1
+            series.in_flight += 1
+
+    def call_finished(self, model, method, failed=False):
+        with self._lock:
+            series = self._get(model, method)
+            series.in_flight -= 1
+            if failed:
+                series.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = {}
+            for (model, method), s in self._series.items():
+                h = s.histogram
+                snapshot[f"{model}/{method}"] = {
+                    "calls": s.calls, "errors": s.errors, "in_flight": s.in_flight, "timed": h.count,
+                    "mean_ms": h.total / h.count / 1e6 if h.count else 0.0,
+                    "p50_ms": h.percentile(50) / 1e6, "p95_ms": h.percentile(95) / 1e6,
+                    "p99_ms": h.percentile(99) / 1e6, "max_ms": h.max / 1e6,
+                }
+            return snapshot
+
+    def prometheus(self):
+        # each metric family must be one contiguous group in the text format
+        with self._lock:
+            series = [(f'model="{_escape(model)}",method="{_escape(method)}"', s)
+                      for (model, method), s in sorted(self._series.items())]
+            lines = ["# TYPE hit137_calls_total counter"]
+            lines += [f"hit137_calls_total{{{labels}}} {s.calls}" for labels, s in series]
+            lines.append("# TYPE hit137_errors_total counter")
+            lines += [f"hit137_errors_total{{{labels}}} {s.errors}" for labels, s in series]
+            lines.append("# TYPE hit137_in_flight gauge")
+            lines += [f"hit137_in_flight{{{labels}}} {s.in_flight}" for labels, s in series]
+            lines.append("# TYPE hit137_latency_seconds summary")
+            for labels, s in series:
+                h = s.histogram
+                for quantile in (0.5, 0.95, 0.99):
+                    value = h.percentile(quantile * 100) / 1e9
+                    lines.append(f'hit137_latency_seconds{{{labels},quantile="{quantile}"}} {value:.9f}')
+                lines.append(f"hit137_latency_seconds_sum{{{labels}}} {h.total / 1e9:.9f}")
+                lines.append(f"hit137_latency_seconds_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+METRICS = MetricsRegistry()
@@ -1,51 +1,458 @@
-from transformers import pipeline
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+import aio
+import runtime
+from preprocess import load_image, prefetch_images
+from registry import REGISTRY
+from results import Prediction
+from tracing import Trace, export_chrome_trace
 from utils import measure_time, log_call
 
+_prewarm_thread = None
+
+def prewarm():
+    # import the heavy frameworks off the UI thread so the first load() doesn't pay for them
+    global _prewarm_thread
+    if _prewarm_thread is None:
+        _prewarm_thread = threading.Thread(target=_import_frameworks, daemon=True)
+        _prewarm_thread.start()
+    return _prewarm_thread
+
+def _import_frameworks():
+    import torch  # noqa: F401
+    import transformers  # noqa: F401
+    from PIL import Image  # noqa: F401
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor(max_workers=4):
+    # one bounded pool for background model work instead of a new thread per click
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aimodel")
+        return _executor
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def padding_stats(batches):
+    """Token accounting for batches of sequence lengths padded to their longest member."""
+    real = sum(sum(lengths) for lengths in batches)
+    padded = sum(max(lengths) * len(lengths) for lengths in batches if lengths)
+    return {"real_tokens": real, "padded_tokens": padded,
+            "padding_ratio": 1 - real / padded if padded else 0.0}
+
+def _id2label(pipe):
+    model = getattr(pipe, "model", None)
+    return model.config.id2label if model is not None else pipe.id2label
+
+def _is_array(value):
+    # numpy arrays and memmaps; PIL images expose __array_interface__ but not ndim
+    return hasattr(value, "ndim") and hasattr(value, "dtype")
+
+def _to_numpy(tensor):
+    return tensor.float().cpu().numpy() if hasattr(tensor, "cpu") else tensor
+
+def _logits(outputs):
+    # transformers forward() gives a ModelOutput, the onnx backend a bare logits array
+    return outputs if _is_array(outputs) else outputs["logits"]
+
 class ModelInfoMixin:
     def model_info(self):
-        return f"Model: {self._model_name}\nTask: {self._task}\n"
+        return (f"Model: {self._model_name}\nTask: {self._task}\n"
+                f"Precision: {self._precision}\nBackend: {self._backend}\n")
 
 class LoggerMixin:
     def log(self, message):
         print(f"[MODEL LOG] {message}")
 
 class AIModel(ModelInfoMixin, LoggerMixin):
-    def __init__(self, model_name, task):
+    modality = None
+    _path_inputs = False  # whether a str input may name a file to read
+    _preprocess_stage = "preprocess"
+
+    def __init__(self, model_name, task, cache=None, device="cpu", precision="fp32", backend="torch",
+                 max_concurrency=1, thread_profile=None, top_k=1, return_logits=False, registry=REGISTRY):
         self._model_name = model_name
         self._task = task
-        self._pipeline = None
+        self._device = device
+        self._precision = precision
+        self._backend = backend
+        self._handle = None
+        self._loaded = False
+        self._cache = cache
+        self._registry = registry
+        self._top_k = top_k
+        self._return_logits = return_logits
+        self._load_lock = threading.Lock()
+        # caps concurrent forward passes on this model so callers don't fight over the same cores
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        # "auto" picks up the profile saved by `python runtime.py calibrate`
+        self._thread_profile = runtime.profile_for(model_name) if thread_profile == "auto" else thread_profile
+        self.traces = deque(maxlen=100)
+        self._async_batchers = weakref.WeakKeyDictionary()
 
     @property
     def model_name(self):
         return self._model_name
 
     def load(self):
-        self.log(f"Loading {self._model_name} for task {self._task}")
-        self._pipeline = pipeline(self._task, model=self._model_name)
+        if self._handle is not None:
+            return
+        with self._load_lock:
+            if self._handle is not None:
+                return
+            self.log(f"Loading {self._model_name} for task {self._task}")
+            self._handle = self._registry.acquire(self._task, self._model_name, self._device,
+                                                  self._precision, self._backend)
+            self._loaded = True
+
+    def load_report(self):
+        phases = self._handle.load_phases if self._handle is not None else {}
+        return "\n".join(f"{name}: {seconds:.2f}s" for name, seconds in phases.items())
+
+    def unload(self):
+        with self._load_lock:
+            if self._handle is not None:
+                self._loaded = False
+                self._handle.release()
+                self._handle = None
+
+    def _cache_namespace(self):
+        return f"{self._model_name}@{self._precision}/{self._backend}/k{self._top_k}"
+
+    def _use_cache(self):
+        # logits are not worth persisting, so callers asking for them always hit the model
+        return self._cache is not None and not self._return_logits
+
+    @contextmanager
+    def _slot(self, trace=None):
+        if self._slots is not None:
+            with trace.span("wait_slot") if trace is not None else nullcontext():
+                self._slots.acquire()
+        try:
+            # restored afterwards: this is usually a shared executor thread that other models reuse
+            with runtime.applied(self._thread_profile):
+                yield
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def _get_pipeline(self):
+        handle = self._handle
+        if handle is None:
+            self.load()
+            handle = self._handle
+        return handle.pipeline
+
+    @property
+    def last_trace(self):
+        return self.traces[-1] if self.traces else None
+
+    def export_chrome_trace(self, path):
+        return export_chrome_trace(list(self.traces), path)
+
+    def _postprocess_params(self, pipe):
+        params = dict(getattr(pipe, "_postprocess_params", {}), top_k=self._top_k)
+        if self._task == "text-classification" and getattr(pipe, "session", None) is None:
+            # transformers' text postprocess only ranks and truncates when _legacy is off,
+            # which pipe(..., top_k=k) does for predict_batch; match it here
+            params["_legacy"] = False
+        return params
+
+    def _preprocess(self, pipe, input_data):
+        return pipe.preprocess(input_data, **getattr(pipe, "_preprocess_params", {}))
+
+    def _run_stages(self, pipe, input_data, trace):
+        # drive the pipeline one stage at a time so each gets its own span
+        if not all(hasattr(pipe, stage) for stage in ("preprocess", "forward", "postprocess")):
+            with trace.span("forward"):
+                return Prediction.from_output(pipe(input_data, top_k=self._top_k))
+        with trace.span(self._preprocess_stage):
+            model_inputs = self._preprocess(pipe, input_data)
+        with trace.span("forward"):
+            outputs = pipe.forward(model_inputs, **getattr(pipe, "_forward_params", {}))
+        with trace.span("postprocess"):
+            logits = _to_numpy(_logits(outputs)[0]) if self._return_logits else None
+            return Prediction.from_output(pipe.postprocess(outputs, **self._postprocess_params(pipe)), logits)
+
+    def _predict_one(self, input_data):
+        trace = Trace(self._model_name)
+        self.traces.append(trace)
+        key = None
+        if self._use_cache():
+            with trace.span("cache_lookup"):
+                key = self._cache.make_key(self._cache_namespace(), input_data, self._path_inputs)
+                cached = self._cache.get(key)
+            if cached is not None:
+                return Prediction.from_dict(cached)
+        with trace.span("load"):
+            pipe = self._get_pipeline()
+        with self._slot(trace):
+            result = self._run_stages(pipe, input_data, trace)
+        if key is not None:
+            self._cache.put(key, result.to_dict())
+        return result
 
     def predict(self, input_data):
         raise NotImplementedError
 
+    @measure_time
+    @log_call
+    def predict_batch(self, inputs, batch_size=8):
+        inputs = list(inputs)
+        results = [None] * len(inputs)
+        keys = [None] * len(inputs)
+        if self._use_cache():
+            for i, input_data in enumerate(inputs):
+                keys[i] = self._cache.make_key(self._cache_namespace(), input_data, self._path_inputs)
+                cached = self._cache.get(keys[i])
+                results[i] = Prediction.from_dict(cached) if cached is not None else None
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        pipe = self._get_pipeline()
+        for chunk in self._plan_batches(pipe, inputs, pending, batch_size):
+            with self._slot():
+                outputs = self._call_pipeline(pipe, [inputs[i] for i in chunk])
+            for i, result in zip(chunk, outputs):
+                results[i] = result
+                if keys[i] is not None:
+                    self._cache.put(keys[i], result.to_dict())
+        return results
+
+    def _call_pipeline(self, pipe, batch):
+        if self._return_logits:
+            return self._forward_batch(pipe, batch)
+        return [Prediction.from_output(output) for output in pipe(batch, batch_size=len(batch), top_k=self._top_k)]
+
+    def _batch_inputs(self, pipe, batch):
+        raise NotImplementedError
+
+    def _forward_batch(self, pipe, batch):
+        # one forward pass over the whole batch, keeping each row's logits
+        if getattr(pipe, "session", None) is not None:  # onnx backend
+            outputs = pipe.forward(pipe._features(batch))
+        else:
+            outputs = pipe.forward(self._batch_inputs(pipe, batch), **getattr(pipe, "_forward_params", {}))
+        logits = _logits(outputs)
+        params = self._postprocess_params(pipe)
+        predictions = []
+        for i in range(len(batch)):
+            row = logits[i:i + 1]
+            output = pipe.postprocess(row if _is_array(outputs) else {"logits": row}, **params)
+            predictions.append(Prediction.from_output(output, _to_numpy(row[0]) if self._return_logits else None))
+        return predictions
+
+    def _plan_batches(self, pipe, inputs, pending, batch_size):
+        # the last chunk may be short; the pipeline pads each batch to its own longest item
+        return [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+
+    def _async_batcher(self):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        batcher = self._async_batchers.get(loop)
+        if batcher is None:
+            batcher = self._async_batchers[loop] = aio.AsyncBatcher(self, get_executor())
+        return batcher
+
+    async def predict_async(self, input_data, timeout=None):
+        # concurrent awaiters on the same loop share one predict_batch call
+        return await aio.predict(self._async_batcher(), input_data, timeout)
+
+    async def stream_async(self, inputs, window=None):
+        async for result in aio.stream(self._async_batcher(), inputs, window):
+            yield result
+
 class TextClassifier(AIModel):  # renamed to fit main.py
-    def __init__(self, model_name="distilbert-base-uncased-finetuned-sst-2-english"):
-        super().__init__(model_name, "text-classification")
+    modality = "text"
+    _preprocess_stage = "tokenize"
+
+    def __init__(self, model_name="distilbert-base-uncased-finetuned-sst-2-english", cache=None,
+                 length_bucketing=False, bucket_window=256, **options):
+        super().__init__(model_name, "text-classification", cache, **options)
+        self.length_bucketing = length_bucketing
+        self.bucket_window = bucket_window
+        self.padding_stats = None
+
+    def token_lengths(self, texts, pipe=None):
+        tokenizer = (pipe or self._get_pipeline()).tokenizer
+        return [len(ids) for ids in tokenizer(list(texts), truncation=True)["input_ids"]]
+
+    def _plan_batches(self, pipe, inputs, pending, batch_size):
+        if not self.length_bucketing:
+            return super()._plan_batches(pipe, inputs, pending, batch_size)
+        lengths = dict(zip(pending, self.token_lengths([inputs[i] for i in pending], pipe)))
+        chunks = []
+        # sort only within a window so a long stream still starts producing batches early
+        for start in range(0, len(pending), self.bucket_window):
+            window = sorted(pending[start:start + self.bucket_window], key=lengths.__getitem__)
+            chunks.extend(window[i:i + batch_size] for i in range(0, len(window), batch_size))
+        self.padding_stats = padding_stats([[lengths[i] for i in chunk] for chunk in chunks])
+        return chunks
 
     @measure_time
     @log_call
     def predict(self, text):
-        if self._pipeline is None:
-            self.load()
-        result = self._pipeline(text)[0]
-        return f"Label: {result['label']} (Confidence: {result['score']:.2f})"
+        return self._predict_one(text)
+
+    def _batch_inputs(self, pipe, batch):
+        return pipe.tokenizer(list(batch), padding=True, truncation=True, return_tensors=pipe.framework)
+
+    @measure_time
+    @log_call
+    def predict_long(self, text, window=512, overlap=None, aggregate="mean", batch_size=None):
+        """Classifies text of any length by scoring overlapping token windows.
+
+        All windows go through the model in one padded batch (or batches of
+        batch_size), and the per-window probabilities are combined with
+        aggregate: "mean", "max" or "attention" (windows weighted by how
+        confident, i.e. low-entropy, they are). window is capped at the
+        tokenizer's model_max_length; overlap defaults to a quarter of it.
+        """
+        import math
+        pipe = self._get_pipeline()
+        tokenizer = pipe.tokenizer
+        ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+        window = min(window, tokenizer.model_max_length)
+        overlap = window // 4 if overlap is None else overlap
+        body = window - tokenizer.num_special_tokens_to_add()
+        if overlap >= body:
+            raise ValueError(f"overlap ({overlap}) must be smaller than the window body ({body} tokens)")
+        step = body - overlap
+        starts = range(0, max(len(ids) - overlap, 1), step)
+        chunks = [tokenizer.build_inputs_with_special_tokens(ids[start:start + body]) for start in starts]
+        batch_size = batch_size or len(chunks)
+        probs = []
+        for start in range(0, len(chunks), batch_size):
+            with self._slot():
+                probs.extend(self._window_probs(pipe, chunks[start:start + batch_size]))
+        labels = _id2label(pipe)
+        if aggregate == "mean":
+            weights = [1.0] * len(probs)
+        elif aggregate == "attention":
+            weights = [math.exp(sum(p * math.log(p) for p in row if p > 0)) for row in probs]
+        elif aggregate != "max":
+            raise ValueError(f"Unknown aggregate {aggregate!r}, expected mean, max or attention")
+        if aggregate == "max":
+            combined = [max(row[j] for row in probs) for j in range(len(labels))]
+        else:
+            combined = [sum(w * row[j] for w, row in zip(weights, probs)) for j in range(len(labels))]
+        total = sum(combined)
+        ranked = sorted(range(len(labels)), key=combined.__getitem__, reverse=True)
+        return Prediction([labels[j] for j in ranked], [combined[j] / total for j in ranked], chunks=len(chunks))
+
+    @staticmethod
+    def _window_probs(pipe, chunks):
+        tokenizer = pipe.tokenizer
+        if getattr(pipe, "session", None) is not None:  # onnx backend
+            from onnx_backend import _softmax
+            features = tokenizer.pad({"input_ids": chunks}, return_tensors="np")
+            features = {name: value.astype("int64") for name, value in features.items()
+                        if name in pipe._input_names}
+            return _softmax(pipe.forward(features)).tolist()
+        import torch
+        features = tokenizer.pad({"input_ids": chunks}, return_tensors="pt")
+        with torch.no_grad():
+            logits = pipe.model(**features.to(pipe.model.device)).logits
+        return torch.softmax(logits.float(), dim=-1).tolist()
 
 class ImageClassifier(AIModel):  # renamed to fit main.py
-    def __init__(self, model_name="google/vit-base-patch16-224"):
-        super().__init__(model_name, "image-classification")
+    modality = "image"
+    _path_inputs = True
+    _preprocess_stage = "preprocess"
+
+    def __init__(self, model_name="google/vit-base-patch16-224", cache=None, **options):
+        super().__init__(model_name, "image-classification", cache, **options)
 
     @measure_time
     @log_call
-    def predict(self, image_path_or_pil):
-        if self._pipeline is None:
-            self.load()
-        result = self._pipeline(image_path_or_pil)[0]
-        return f"Label: {result['label']} (Confidence: {result['score']:.2f})"
+    def predict(self, image):
+        # image: path, PIL image, encoded bytes/memoryview, or a uint8 HWC array (see frame/open_raw)
+        return self._predict_one(image)
+
+    @staticmethod
+    def frame(buffer, shape):
+        """Zero-copy uint8 HWC view over raw pixels already held in memory (bytes, memoryview, ...)."""
+        import numpy as np
+        return np.frombuffer(buffer, dtype=np.uint8).reshape(shape)
+
+    @staticmethod
+    def open_raw(path, shape, offset=0):
+        """Memory-maps a raw uint8 HWC image file; pages are read only as the processor touches them."""
+        import numpy as np
+        return np.memmap(path, dtype=np.uint8, mode="r", shape=tuple(shape), offset=offset)
+
+    @staticmethod
+    def _ingest(image):
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            # encoded (PNG/JPEG...) bytes: decode straight from memory rather than via a file
+            import io
+            from PIL import Image
+            return Image.open(io.BytesIO(image)).convert("RGB")
+        return image
+
+    @staticmethod
+    def _array_inputs(pipe, images):
+        # the pipeline's own preprocess only takes paths and PIL images; arrays go to the processor directly
+        model_inputs = pipe.image_processor(images=images, return_tensors=pipe.framework)
+        if pipe.framework == "pt" and getattr(pipe, "torch_dtype", None) is not None:
+            model_inputs = model_inputs.to(pipe.torch_dtype)
+        return model_inputs
+
+    def _run_stages(self, pipe, input_data, trace):
+        return super()._run_stages(pipe, self._ingest(input_data), trace)
+
+    def _preprocess(self, pipe, input_data):
+        if _is_array(input_data) and hasattr(pipe, "image_processor"):
+            return self._array_inputs(pipe, [input_data])
+        return super()._preprocess(pipe, input_data)
+
+    def _batch_inputs(self, pipe, batch):
+        size = self.input_size(pipe)
+        images = []
+        for image in batch:
+            if isinstance(image, str):
+                image = load_image(image, size)
+            elif not _is_array(image):
+                image = image.convert("RGB")  # the pipeline's own preprocess would have done this
+            images.append(image)
+        return self._array_inputs(pipe, images)
+
+    def _call_pipeline(self, pipe, batch):
+        batch = [self._ingest(image) for image in batch]
+        if any(_is_array(image) for image in batch) and hasattr(pipe, "image_processor"):
+            return self._forward_batch(pipe, batch)
+        return super()._call_pipeline(pipe, batch)
+
+    def input_size(self, pipe=None):
+        """(width, height) the processor resizes to, or None when it keeps the aspect ratio."""
+        pipe = pipe or self._get_pipeline()
+        processor = getattr(pipe, "image_processor", None) or getattr(pipe, "processor", None)
+        size = getattr(processor, "size", None)
+        if isinstance(size, int):
+            return (size, size)
+        if isinstance(size, dict) and "height" in size and "width" in size:
+            return (size["width"], size["height"])
+        return None  # e.g. shortest_edge: pre-resizing to a square would distort the image
+
+    def predict_files(self, paths, batch_size=16, workers=4, depth=2, size=None):
+        # yields (path, result) with image decoding running ahead of the model on a thread pool
+        size = size or self.input_size()
+        batches = _chunks(((path, path) for path in paths), batch_size)
+        for batch in prefetch_images(batches, size=size, workers=workers, depth=depth):
+            results = self.predict_batch([image for _, image in batch], batch_size=batch_size)
+            for (path, _), result in zip(batch, results):
+                yield path, result
@@ -0,0 +1,152 @@
+import os
+import re
+import sys
+
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hit137", "onnx")
+BACKENDS = ("torch", "onnx")
+
+def _softmax(logits):
+    import numpy as np
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+def export_dir(model_name, precision="fp32"):
+    return os.path.join(ONNX_CACHE_DIR, re.sub(r"[^\w.-]", "_", model_name), precision)
+
+def export(task, model_name, precision="fp32"):
+    """Exports model_name to ONNX once; later calls reuse the cached graph."""
+    target = export_dir(model_name, precision)
+    graph = os.path.join(target, "model.onnx")
+    if os.path.exists(graph):
+        return target
+    if precision not in ("fp32", "int8"):
+        raise ValueError(f"ONNX backend supports fp32 and int8, not {precision!r}")
+    import torch
+    from transformers import (AutoConfig, AutoImageProcessor, AutoModelForImageClassification,
+                              AutoModelForSequenceClassification, AutoTokenizer)
+    os.makedirs(target, exist_ok=True)
+    print(f"[ONNX] Exporting {model_name} to {target}")
+    if task == "text-classification":
+        processor = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        sample = processor(["export sample"], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask") if name in sample]
+        args = tuple(sample[name] for name in input_names)
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    elif task == "image-classification":
+        processor = AutoImageProcessor.from_pretrained(model_name)
+        model = AutoModelForImageClassification.from_pretrained(model_name).eval()
+        size = model.config.image_size
+        input_names = ["pixel_values"]
+        args = (torch.zeros(1, model.config.num_channels, size, size),)
+        dynamic_axes = {"pixel_values": {0: "batch"}}
+    else:
+        raise ValueError(f"ONNX backend does not support task {task!r}")
+    dynamic_axes["logits"] = {0: "batch"}
+    fp32_graph = graph if precision == "fp32" else os.path.join(target, "model_fp32.onnx")
+    with torch.no_grad():
+        torch.onnx.export(model, args, fp32_graph, input_names=input_names, output_names=["logits"],
+                          dynamic_axes=dynamic_axes, opset_version=14)
+    if precision == "int8":
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32_graph, graph, weight_type=QuantType.QInt8)
+        os.remove(fp32_graph)
+    processor.save_pretrained(target)
+    AutoConfig.from_pretrained(model_name).save_pretrained(target)
+    return target
+
+class OnnxPipeline:
+    """onnxruntime stand-in for a transformers pipeline with the same call and output shape."""
+
+    def __init__(self, task, model_dir, top_k=5):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoImageProcessor, AutoTokenizer
+        self.task = task
+        self.model = None
+        self.top_k = 1 if task == "text-classification" else top_k
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(os.path.join(model_dir, "model.onnx"), options,
+                                            providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.id2label = AutoConfig.from_pretrained(model_dir).id2label
+        if task == "text-classification":
+            self.processor = self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        else:
+            self.processor = AutoImageProcessor.from_pretrained(model_dir)
+
+    def _features(self, batch):
+        if self.task == "text-classification":
+            encoded = self.processor(batch, padding=True, truncation=True, return_tensors="np")
+            return {name: value.astype("int64") for name, value in encoded.items() if name in self._input_names}
+        from PIL import Image
+        images = [Image.open(x).convert("RGB") if isinstance(x, str) else x for x in batch]
+        return {"pixel_values": self.processor(images, return_tensors="np")["pixel_values"]}
+
+    def _format(self, probs, top_k=None):
+        ranked = probs.argsort()[::-1][:top_k or self.top_k]
+        results = [{"label": self.id2label[int(i)], "score": float(probs[i])} for i in ranked]
+        # like transformers, text returns a bare dict only for the legacy call without top_k
+        legacy = self.task == "text-classification" and top_k is None
+        return results[0] if legacy else results
+
+    # single-input stages mirroring transformers.Pipeline, so callers can time them separately
+    def preprocess(self, input_data):
+        return self._features([input_data])
+
+    def forward(self, features):
+        return self.session.run(["logits"], features)[0]
+
+    def postprocess(self, logits, top_k=None):
+        return self._format(_softmax(logits)[0], top_k)
+
+    def __call__(self, inputs, batch_size=None, top_k=None):
+        single = not isinstance(inputs, list)
+        batch = [inputs] if single else inputs
+        batch_size = batch_size or len(batch)
+        outputs = []
+        for start in range(0, len(batch), batch_size):
+            logits = self.forward(self._features(batch[start:start + batch_size]))
+            outputs.extend(self._format(p, top_k) for p in _softmax(logits))
+        if single:
+            return outputs if self.task == "text-classification" and top_k is None else outputs[0]
+        return outputs
+
+def build_pipeline(task, model_name, precision="fp32"):
+    return OnnxPipeline(task, export(task, model_name, precision))
+
+def check_parity(model_class, inputs, atol=1e-3, single=False, **options):
+    """Runs inputs through the torch and onnx backends and lists any disagreements.
+
+    single=True goes through predict() one input at a time instead of
+    predict_batch(). A different top label only counts when torch's top two
+    scores are more than atol apart; near-ties can legitimately flip on float noise.
+    """
+    options.setdefault("top_k", 2)
+    results = []
+    for backend in ("torch", "onnx"):
+        model = model_class(backend=backend, **options)
+        results.append([model.predict(item) for item in inputs] if single else model.predict_batch(inputs))
+    torch_results, onnx_results = results
+    mismatches = []
+    for item, expected, actual in zip(inputs, torch_results, onnx_results):
+        tied = len(expected.scores) > 1 and expected.scores[0] - expected.scores[1] <= atol
+        if (expected.label != actual.label and not tied) or abs(expected.score - actual.score) > atol:
+            mismatches.append((item, expected, actual))
+    return mismatches
+
+if __name__ == "__main__":
+    # usage: python onnx_backend.py [image files...]   (no arguments checks the text model)
+    from models import TextClassifier, ImageClassifier
+    if sys.argv[1:]:
+        model_class, inputs = ImageClassifier, sys.argv[1:]
+    else:
+        model_class = TextClassifier
+        inputs = ["This is a fantastic movie! I loved every moment of it.",
+                  "The plot was dull and the acting was worse.",
+                  "It was fine, nothing special."]
+    mismatches = check_parity(model_class, inputs)
+    for item, expected, actual in mismatches:
+        print(f"MISMATCH {item!r}: torch={expected} onnx={actual}")
+    print(f"{len(inputs) - len(mismatches)}/{len(inputs)} inputs match between torch and onnx")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+from models import TextClassifier, ImageClassifier
+from registry import ModelRegistry, PRECISIONS, current_rss
+
+# small held-out SST-2 style sample with gold labels
+TEXT_SAMPLES = [
+    ("This is a fantastic movie! I loved every moment of it.", "POSITIVE"),
+    ("A beautifully shot, moving story with a great cast.", "POSITIVE"),
+    ("I laughed, I cried, I would happily watch it again.", "POSITIVE"),
+    ("The soundtrack alone is worth the price of the ticket.", "POSITIVE"),
+    ("Sharp writing and a surprisingly warm ending.", "POSITIVE"),
+    ("One of the best performances I have seen this year.", "POSITIVE"),
+    ("The plot was dull and the acting was worse.", "NEGATIVE"),
+    ("Two hours of my life I will never get back.", "NEGATIVE"),
+    ("Clumsy dialogue and a story that goes nowhere.", "NEGATIVE"),
+    ("I walked out halfway through, it was that boring.", "NEGATIVE"),
+    ("The jokes fall flat and the pacing drags.", "NEGATIVE"),
+    ("A lazy sequel that adds nothing to the original.", "NEGATIVE"),
+]
+
+def evaluate(model_class, samples, precision, repeats=3):
+    # a private registry so every precision really loads its own copy of the weights
+    model = model_class(precision=precision, registry=ModelRegistry())
+    rss_before = current_rss()
+    start = time.perf_counter()
+    model.load()
+    load_s = time.perf_counter() - start
+    memory_mb = (current_rss() - rss_before) / (1024 * 1024)
+    inputs = [s for s, _ in samples]
+    model.predict_batch(inputs[:1])  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        results = model.predict_batch(inputs, batch_size=len(inputs))
+    latency_ms = (time.perf_counter() - start) / (repeats * len(inputs)) * 1000
+    model.unload()
+    return {"precision": precision, "load_s": load_s, "memory_mb": memory_mb,
+            "latency_ms": latency_ms, "results": results}
+
+def compare(model_class, samples, precisions=PRECISIONS):
+    reports = [evaluate(model_class, samples, p) for p in precisions]
+    reference = reports[0]["results"]
+    gold = [label for _, label in samples]
+    for report in reports:
+        results = report.pop("results")
+        report["agreement"] = sum(r.label == ref.label for r, ref in zip(results, reference)) / len(samples)
+        report["max_score_delta"] = max(abs(r.score - ref.score) for r, ref in zip(results, reference))
+        if all(gold):
+            report["accuracy"] = sum(r.label == g for r, g in zip(results, gold)) / len(samples)
+    base = reports[0]
+    for report in reports:
+        report["speedup"] = base["latency_ms"] / report["latency_ms"]
+        if "accuracy" in report:
+            report["accuracy_delta"] = report["accuracy"] - base["accuracy"]
+    return reports
+
+def print_report(reports):
+    print(f"{'precision':<10}{'load s':>8}{'mem MB':>9}{'ms/item':>9}{'speedup':>9}{'agree':>8}{'max dscore':>12}{'acc delta':>11}")
+    for r in reports:
+        acc = f"{r['accuracy_delta']:+.3f}" if "accuracy_delta" in r else "n/a"
+        print(f"{r['precision']:<10}{r['load_s']:>8.2f}{r['memory_mb']:>9.0f}{r['latency_ms']:>9.2f}"
+              f"{r['speedup']:>8.2f}x{r['agreement']:>8.2f}{r['max_score_delta']:>12.4f}{acc:>11}")
+
+if __name__ == "__main__":
+    # usage: python precision_report.py [text | image <directory of held-out images>]
+    if len(sys.argv) > 2 and sys.argv[1] == "image":
+        folder = sys.argv[2]
+        paths = sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                       if name.lower().endswith((".jpg", ".jpeg", ".png", ".bmp")))
+        print_report(compare(ImageClassifier, [(p, None) for p in paths]))
+    else:
+        print_report(compare(TextClassifier, TEXT_SAMPLES))
@@ -0,0 +1,30 @@
+import functools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+def load_image(path, size=None):
+    # decode, force RGB and, given the model's (width, height), resize up front so the pipeline only has to normalize
+    from PIL import Image
+    with Image.open(path) as image:
+        if size is None:
+            return image.convert("RGB")
+        image.draft("RGB", size)  # lets JPEG decode at reduced scale when possible
+        return image.convert("RGB").resize(size, Image.BILINEAR)
+
+def prefetch_images(batches, size=None, workers=4, depth=2, processes=False):
+    """Decodes batches of (id, path) records on a pool ahead of the consumer.
+
+    Yields batches of (id, PIL image) in input order while up to `depth`
+    further batches are decoding in the background, so decode overlaps with
+    whatever the consumer (usually a forward pass) is doing.
+    """
+    pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    decode = functools.partial(load_image, size=size)
+    pending = deque()
+    with pool_class(max_workers=workers) as pool:
+        for batch in batches:
+            pending.append([(record_id, pool.submit(decode, path)) for record_id, path in batch])
+            if len(pending) > depth:
+                yield [(record_id, future.result()) for record_id, future in pending.popleft()]
+        while pending:
+            yield [(record_id, future.result()) for record_id, future in pending.popleft()]
@@ -0,0 +1,231 @@
+import gc
+import os
+import threading
+import time
+
+PRECISIONS = ("fp32", "bf16", "int8")
+
+def _build_pipeline(task, model_name, device, dtype, backend="torch"):
+    if backend == "onnx":
+        import onnx_backend
+        return onnx_backend.build_pipeline(task, model_name, dtype)
+    if backend != "torch":
+        raise ValueError(f"Unknown backend {backend!r}")
+    if dtype not in PRECISIONS:
+        raise ValueError(f"Unknown precision {dtype!r}, expected one of {', '.join(PRECISIONS)}")
+    import fastload
+    return fastload.build_pipeline(task, model_name, device, dtype)
+
+def _pipeline_bytes(pipe):
+    model = getattr(pipe, "model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return 0
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+def _weights_bytes(task, model_name, device, dtype, backend="torch"):
+    # rough size of a model that has not been loaded yet, from its weight files on disk; 0 if unknown
+    if backend == "onnx":
+        import onnx_backend
+        graph = os.path.join(onnx_backend.export_dir(model_name, dtype), "model.onnx")
+        return os.path.getsize(graph) if os.path.exists(graph) else 0
+    try:
+        import fastload
+        path = fastload.local_path(model_name)
+    except ImportError:
+        return 0
+    if path is None:
+        return 0
+    files = [name for name in os.listdir(path) if name.endswith(".safetensors")] or \
+            [name for name in os.listdir(path) if name.endswith(".bin")]
+    nbytes = sum(os.path.getsize(os.path.join(path, name)) for name in files)
+    return nbytes // {"bf16": 2, "int8": 4}.get(dtype, 1)
+
+def current_rss():
+    # resident set size of this process in bytes; 0 where /proc is unavailable
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+def _env_mb(name):
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+def _mb(nbytes):
+    return nbytes / (1024 * 1024)
+
+class _Entry:
+    def __init__(self, key):
+        self.key = key
+        self.pipeline = None
+        self.refs = 0
+        self.nbytes = 0
+        self.loads = 0
+        self.load_phases = {}
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+class ModelHandle:
+    def __init__(self, registry, key):
+        self._registry = registry
+        self.key = key
+        self._released = False
+
+    @property
+    def pipeline(self):
+        # looked up on every access so an evicted model is transparently reloaded
+        if self._released:
+            raise RuntimeError("Handle has been released")
+        return self._registry.get(self.key)
+
+    @property
+    def load_phases(self):
+        return self._registry.load_phases(self.key)
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._registry.release(self.key)
+
+class ModelRegistry:
+    """Loads each (task, model, device, dtype, backend) pipeline once and shares it.
+
+    Handles are reference counted. Idle pipelines are unloaded, least recently
+    used first, whenever their total size exceeds memory_budget_mb. Independently,
+    rss_ceiling_mb caps the process RSS: loading a model that would cross it
+    evicts the least recently used resident model, held or not, and that model
+    is reloaded the next time one of its handles is used. Because freed memory
+    rarely leaves the process, RSS is accounted as the RSS at creation plus the
+    tracked size of each resident model rather than re-read after evictions.
+    """
+
+    def __init__(self, memory_budget_mb=None, rss_ceiling_mb=None, loader=_build_pipeline,
+                 estimator=_weights_bytes):
+        self.memory_budget_mb = memory_budget_mb
+        self.rss_ceiling_mb = rss_ceiling_mb
+        self._loader = loader
+        self._estimator = estimator
+        self._baseline_rss = current_rss()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, task, model_name, device="cpu", dtype="fp32", backend="torch"):
+        key = (task, model_name, device, dtype, backend)
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry(key))
+            entry.refs += 1
+        try:
+            self._ensure(entry)
+        except Exception:
+            self.release(key)
+            raise
+        self._enforce_budget()
+        return ModelHandle(self, key)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(f"{key[1]} is not registered")
+        return self._ensure(entry)
+
+    def _ensure(self, entry):
+        # per-entry lock: different models load in parallel, the same model loads once
+        with entry.lock:
+            pipe = entry.pipeline
+            if pipe is None:
+                # unseen models are sized from their weight files; reloads use the measured size
+                self._make_room(entry, entry.nbytes or self._estimator(*entry.key))
+                rss_before = current_rss()
+                start = time.perf_counter()
+                pipe = self._loader(*entry.key)
+                entry.load_phases = dict(getattr(pipe, "load_phases", {}), total=time.perf_counter() - start)
+                entry.nbytes = max(current_rss() - rss_before, _pipeline_bytes(pipe))
+                entry.loads += 1
+                entry.pipeline = pipe
+                # the estimate may have been low (or missing): settle up with the real size
+                self._make_room(entry, entry.nbytes)
+            entry.last_used = time.monotonic()
+            return pipe
+
+    def _make_room(self, incoming, needed):
+        if self.rss_ceiling_mb is None:
+            return
+        ceiling = self.rss_ceiling_mb * 1024 * 1024
+        evicted = False
+        with self._lock:
+            victims = sorted((e for e in self._entries.values() if e is not incoming and e.pipeline is not None),
+                             key=lambda e: e.last_used)
+            total = self._baseline_rss + sum(e.nbytes for e in victims) + needed
+            for victim in victims:
+                if total <= ceiling:
+                    break
+                total -= victim.nbytes
+                self._evict(victim)
+                evicted = True
+        if evicted:
+            gc.collect()
+
+    def load_phases(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry.load_phases) if entry is not None else {}
+
+    def release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refs == 0:
+                return
+            entry.refs -= 1
+            entry.last_used = time.monotonic()
+        self._enforce_budget()
+
+    def resident_bytes(self):
+        with self._lock:
+            return sum(e.nbytes for e in self._entries.values() if e.pipeline is not None)
+
+    def _enforce_budget(self):
+        if self.memory_budget_mb is None:
+            return
+        budget = self.memory_budget_mb * 1024 * 1024
+        with self._lock:
+            resident = [e for e in self._entries.values() if e.pipeline is not None]
+            total = sum(e.nbytes for e in resident)
+            for entry in sorted((e for e in resident if e.refs == 0), key=lambda e: e.last_used):
+                if total <= budget:
+                    break
+                total -= entry.nbytes
+                self._evict(entry)
+
+    def _evict(self, entry):
+        if entry.pipeline is None:
+            return
+        entry.pipeline = None
+        print(f"[REGISTRY] Evicted {entry.key[1]} ({_mb(entry.nbytes):.0f} MB)")
+        if entry.refs == 0:
+            del self._entries[entry.key]
+
+    def unload_idle(self):
+        with self._lock:
+            for entry in [e for e in self._entries.values() if e.refs == 0]:
+                self._evict(entry)
+
+    def stats(self):
+        with self._lock:
+            return [{"task": e.key[0], "model": e.key[1], "device": e.key[2], "dtype": e.key[3],
+                     "backend": e.key[4], "refs": e.refs, "mb": _mb(e.nbytes), "loads": e.loads,
+                     "loaded": e.pipeline is not None}
+                    for e in self._entries.values()]
+
+    def resident_summary(self):
+        resident = [s for s in self.stats() if s["loaded"]]
+        models = ", ".join(f"{s['model'].split('/')[-1]} ({s['mb']:.0f} MB)" for s in resident) or "none"
+        summary = f"Resident: {models} | RSS {_mb(current_rss()):.0f} MB"
+        if self.rss_ceiling_mb is not None:
+            summary += f" / {self.rss_ceiling_mb:.0f} MB"
+        return summary
+
+REGISTRY = ModelRegistry(memory_budget_mb=_env_mb("HIT137_MEMORY_BUDGET_MB"),
+                         rss_ceiling_mb=_env_mb("HIT137_RSS_CEILING_MB"))
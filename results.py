@@ -0,0 +1,53 @@
+class Prediction:
+    """Compact classifier output: ranked labels and scores, plus optional raw logits.
+
+    Nothing here formats strings; presentation code calls format_prediction().
+    """
+
+    __slots__ = ("labels", "scores", "logits", "chunks")
+
+    def __init__(self, labels, scores, logits=None, chunks=None):
+        self.labels = tuple(labels)
+        self.scores = tuple(scores)
+        self.logits = logits
+        self.chunks = chunks
+
+    @classmethod
+    def from_output(cls, output, logits=None):
+        # pipelines return one dict (text, top_k=1) or a ranked list of dicts
+        ranked = output if isinstance(output, list) else [output]
+        return cls([item["label"] for item in ranked], [float(item["score"]) for item in ranked], logits)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["labels"], data["scores"], data.get("logits"), data.get("chunks"))
+
+    @property
+    def label(self):
+        return self.labels[0]
+
+    @property
+    def score(self):
+        return self.scores[0]
+
+    def top(self, k):
+        return list(zip(self.labels[:k], self.scores[:k]))
+
+    def to_dict(self):
+        data = {"label": self.label, "score": self.score, "labels": list(self.labels), "scores": list(self.scores)}
+        if self.logits is not None:
+            data["logits"] = [float(value) for value in self.logits]
+        if self.chunks is not None:
+            data["chunks"] = self.chunks
+        return data
+
+    def __repr__(self):
+        return f"Prediction(label={self.label!r}, score={self.score:.4f}, k={len(self.labels)})"
+
+def format_prediction(prediction, heading="Label", digits=2, top_k=1):
+    lines = [f"{heading}: {prediction.label} (Confidence: {prediction.score:.{digits}f})"]
+    for label, score in prediction.top(top_k)[1:]:
+        lines.append(f"  {label}: {score:.{digits}f}")
+    if prediction.chunks is not None:
+        lines.append(f"Chunks: {prediction.chunks}")
+    return "\n".join(lines)
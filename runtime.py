@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "hit137", "thread_profiles.json")
+_active_lock = threading.Lock()
+_active = []  # profiles currently applied through applied()
+_base_threads = None  # torch's own intra-op count, restored once nothing is applied
+
+class ThreadProfile:
+    # no inter-op setting: torch only accepts it once per process, so it can be neither calibrated nor applied per model
+    __slots__ = ("intra_op", "cpus")
+
+    def __init__(self, intra_op=None, cpus=None):
+        self.intra_op = intra_op
+        self.cpus = sorted(cpus) if cpus else None
+
+    def to_dict(self):
+        return {"intra_op": self.intra_op, "cpus": self.cpus}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("intra_op"), data.get("cpus"))
+
+    def __repr__(self):
+        return f"ThreadProfile(intra_op={self.intra_op}, cpus={self.cpus})"
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def split_cpus(count):
+    """Partitions the usable CPUs into `count` disjoint profiles, one per concurrently running model."""
+    cpus = available_cpus()
+    count = max(1, min(count, len(cpus)))
+    size = len(cpus) // count
+    return [ThreadProfile(intra_op=size, cpus=cpus[i * size:(i + 1) * size]) for i in range(count)]
+
+def _set_intra_op():
+    # process wide, so concurrent models share the smallest active count and none oversubscribes its share
+    import torch
+    torch.set_num_threads(min(p.intra_op for p in _active) if _active else _base_threads)
+
+@contextmanager
+def applied(profile):
+    """Applies profile for the duration of the block, then restores the thread's affinity and torch's thread count.
+
+    CPU pinning is per thread and always honoured. torch's intra-op count is
+    process wide, so a profile's intra_op only applies exactly while its model
+    runs alone; with several profiles active every model gets the smallest of
+    their counts (with split_cpus() shares, that is each model's share).
+    """
+    global _base_threads
+    if profile is None:
+        yield
+        return
+    affinity = None
+    if profile.cpus and hasattr(os, "sched_setaffinity"):
+        affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, profile.cpus)
+    if profile.intra_op:
+        import torch
+        with _active_lock:
+            if not _active:
+                _base_threads = torch.get_num_threads()
+            _active.append(profile)
+            _set_intra_op()
+    try:
+        yield
+    finally:
+        if profile.intra_op:
+            with _active_lock:
+                _active.remove(profile)
+                _set_intra_op()
+        if affinity is not None:
+            os.sched_setaffinity(0, affinity)
+
+def load_profiles(path=PROFILE_PATH):
+    try:
+        with open(path) as f:
+            return {name: ThreadProfile.from_dict(data) for name, data in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+def save_profile(model_name, profile, path=PROFILE_PATH):
+    profiles = load_profiles(path)
+    profiles[model_name] = profile
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({name: p.to_dict() for name, p in profiles.items()}, f, indent=2)
+
+def profile_for(model_name, path=PROFILE_PATH):
+    return load_profiles(path).get(model_name)
+
+def calibrate(model, inputs, thread_counts=None, batch_size=8, objective="throughput", repeats=3):
+    """Times model over inputs at each intra-op thread count and returns (best profile, measurements)."""
+    cpus = available_cpus()
+    thread_counts = thread_counts or sorted({1, 2, 4, len(cpus) // 2 or 1, len(cpus)})
+    model.load()
+    measurements = []
+    for threads in thread_counts:
+        profile = ThreadProfile(intra_op=threads, cpus=cpus[:threads])
+        with applied(profile):
+            model.predict_batch(inputs[:batch_size], batch_size=batch_size)  # warm-up at this setting
+            latencies = []
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for offset in range(0, len(inputs), batch_size):
+                    batch_start = time.perf_counter()
+                    model.predict_batch(inputs[offset:offset + batch_size], batch_size=batch_size)
+                    latencies.append(time.perf_counter() - batch_start)
+            elapsed = time.perf_counter() - start
+        latencies.sort()
+        measurements.append({"threads": threads, "items_per_s": repeats * len(inputs) / elapsed,
+                             "p50_ms": latencies[len(latencies) // 2] * 1000, "profile": profile})
+        print(f"  {threads:>3} threads: {measurements[-1]['items_per_s']:.1f} items/s, "
+              f"p50 {measurements[-1]['p50_ms']:.1f} ms")
+    if objective == "latency":
+        best = min(measurements, key=lambda m: m["p50_ms"])
+    else:
+        best = max(measurements, key=lambda m: m["items_per_s"])
+    return best["profile"], measurements
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate torch thread settings for a classifier.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cal = sub.add_parser("calibrate")
+    cal.add_argument("model", choices=["text", "image"])
+    cal.add_argument("--model-name", default=None)
+    cal.add_argument("--threads", nargs="+", type=int, default=None)
+    cal.add_argument("--batch-size", type=int, default=8)
+    cal.add_argument("--objective", choices=["throughput", "latency"], default="throughput")
+    sub.add_parser("show")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        for name, profile in load_profiles().items():
+            print(f"{name}: {profile}")
+        return 0
+
+    import bench
+    from models import TextClassifier, ImageClassifier
+    model_class, corpus = (TextClassifier, bench.text_corpus(64)) if args.model == "text" \
+        else (ImageClassifier, bench.image_corpus(16))
+    model = model_class(model_name=args.model_name) if args.model_name else model_class()
+    print(f"Calibrating {model.model_name} for {args.objective}")
+    best, _ = calibrate(model, corpus, args.threads, args.batch_size, args.objective)
+    save_profile(model.model_name, best)
+    print(f"Saved {best} to {PROFILE_PATH}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+STATS_WINDOW = 10000  # latency percentiles cover the most recent requests only
+
+class QueueFull(Exception):
+    pass
+
+class _Request:
+    __slots__ = ("input_data", "future", "enqueued")
+
+    def __init__(self, input_data):
+        self.input_data = input_data
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+class BatchScheduler:
+    """Coalesces concurrent predict requests into batched forward passes.
+
+    Requests wait until max_batch_size are queued or the oldest one has
+    waited max_wait_ms, then go through model.predict_batch together.
+    """
+
+    def __init__(self, model, max_batch_size=16, max_wait_ms=10, max_queue_depth=None):
+        self._model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue_depth = max_queue_depth
+        self._queue = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._latencies = deque(maxlen=STATS_WINDOW)
+        self._requests = 0
+        self._batches = 0
+        self._started = None
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    @property
+    def model(self):
+        return self._model
+
+    def submit(self, input_data):
+        request = _Request(input_data)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler is closed")
+            if self.max_queue_depth is not None and len(self._queue) >= self.max_queue_depth:
+                raise QueueFull(f"{len(self._queue)} requests already queued")
+            if self._started is None:
+                self._started = request.enqueued
+            self._queue.append(request)
+            self._cond.notify()
+        return request.future
+
+    def predict(self, input_data, timeout=None):
+        return self.submit(input_data).result(timeout)
+
+    def queue_depth(self):
+        with self._cond:
+            return len(self._queue)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            deadline = self._queue[0].enqueued + self.max_wait_ms / 1000
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self._model.predict_batch([r.input_data for r in batch], batch_size=len(batch))
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            done = time.perf_counter()
+            # counted before any waiter wakes, so stats() right after a result always includes it
+            with self._cond:
+                self._latencies.extend(done - request.enqueued for request in batch)
+                self._requests += len(batch)
+                self._batches += 1
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+    def stats(self):
+        with self._cond:
+            latencies = sorted(self._latencies)
+            requests, batches = self._requests, self._batches
+        if not latencies:
+            return {"requests": 0, "batches": 0}
+        elapsed = time.perf_counter() - self._started
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "requests": requests,
+            "batches": batches,
+            "mean_batch_size": requests / batches,
+            "throughput_rps": requests / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": _percentile(latencies, 50) * 1000,
+            "p99_ms": _percentile(latencies, 99) * 1000,
+        }
+
+    def report(self):
+        s = self.stats()
+        if not s["requests"]:
+            return "No requests served yet"
+        return (f"batch<={s['max_batch_size']} wait<={s['max_wait_ms']}ms: "
+                f"{s['requests']} requests in {s['batches']} batches "
+                f"(mean {s['mean_batch_size']:.1f}), {s['throughput_rps']:.1f} req/s, "
+                f"p50 {s['p50_ms']:.1f}ms, p99 {s['p99_ms']:.1f}ms")
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def sweep(model, inputs, settings, concurrency=8):
+    """Replays inputs through a scheduler for each (max_batch_size, max_wait_ms) pair."""
+    from concurrent.futures import ThreadPoolExecutor
+    reports = []
+    for max_batch_size, max_wait_ms in settings:
+        with BatchScheduler(model, max_batch_size, max_wait_ms) as scheduler:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(scheduler.predict, inputs))
+            reports.append(scheduler.stats())
+    return reports
+
+if __name__ == "__main__":
+    from models import TextClassifier
+    model = TextClassifier()
+    model.load()
+    corpus = ["This is a fantastic movie! I loved every moment of it.",
+              "The plot was dull and the acting was worse."] * 64
+    for stats in sweep(model, corpus, [(1, 0), (8, 5), (16, 10), (32, 20)]):
+        print(stats)
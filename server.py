@@ -0,0 +1,175 @@
+import argparse
+import base64
+import io
+import json
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from metrics import METRICS
+from models import TextClassifier, ImageClassifier
+from scheduler import BatchScheduler, QueueFull
+
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+class InferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, schedulers, request_timeout=30):
+        super().__init__(address, InferenceHandler)
+        self.schedulers = schedulers
+        self.request_timeout = request_timeout
+
+    def load_models(self):
+        for name, scheduler in self.schedulers.items():
+            try:
+                scheduler.model.load()
+            except Exception as e:
+                print(f"[SERVER] Failed to load {name} model: {e}")
+
+    def readiness(self):
+        return {name: bool(s.model._loaded) for name, s in self.schedulers.items()}
+
+def _decode_image(data):
+    from PIL import Image
+    return Image.open(io.BytesIO(data)).convert("RGB")
+
+def _multipart_file(content_type, body, field="image"):
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == field:
+            return part.get_payload(decode=True)
+    return None
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # keep stdout quiet under load; use /metrics instead
+
+    def _send(self, status, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            models = self.server.readiness()
+            self._send(200 if all(models.values()) else 503, {"ready": all(models.values()), "models": models})
+        elif self.path == "/metrics":
+            self._send(200, METRICS.prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        kind = {"/v1/text": "text", "/v1/image": "image"}.get(self.path)
+        scheduler = self.server.schedulers.get(kind)
+        if scheduler is None:
+            self.close_connection = True  # the body is left unread, so it can't be followed by another request
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True  # without a usable length the body can't be skipped
+            self._send(400, {"error": "bad request: invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send(413, {"error": "request body too large"})
+            return
+        body = self.rfile.read(length)
+        try:
+            inputs = self._parse_inputs(kind, body)
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            self._send(400, {"error": f"bad request: {e}"})
+            return
+        if scheduler.max_queue_depth is not None and len(inputs) > scheduler.max_queue_depth:
+            # could never fit in the queue, so retrying would not help
+            self._send(413, {"error": f"{len(inputs)} inputs exceed the queue depth of {scheduler.max_queue_depth}"})
+            return
+        futures = []
+        try:
+            for item in inputs:
+                futures.append(scheduler.submit(item))
+        except QueueFull:
+            for future in futures:
+                future.cancel()
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            results = [future.result(self.server.request_timeout) for future in futures]
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+            return
+        self._send(200, {"results": [result.to_dict() for result in results]})
+
+    def _parse_inputs(self, kind, body):
+        content_type = self.headers.get("Content-Type", "")
+        if kind == "image" and content_type.startswith("multipart/form-data"):
+            data = _multipart_file(content_type, body)
+            if data is None:
+                raise ValueError("multipart body has no 'image' field")
+            return [_decode_image(data)]
+        payload = json.loads(body or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("body must be a JSON object")
+        plural = "texts" if kind == "text" else "images"
+        if plural in payload and not isinstance(payload[plural], list):
+            raise ValueError(f"'{plural}' must be a list")
+        if kind == "text":
+            texts = payload["texts"] if "texts" in payload else [payload["text"]]
+            if not all(isinstance(t, str) for t in texts):
+                raise ValueError("text inputs must be strings")
+            return texts
+        encoded = payload["images"] if "images" in payload else [payload["image"]]
+        if not all(isinstance(item, str) for item in encoded):
+            raise ValueError("image inputs must be base64 strings")
+        return [_decode_image(base64.b64decode(item)) for item in encoded]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the classifiers over HTTP with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8137)
+    parser.add_argument("--models", nargs="+", choices=["text", "image"], default=["text", "image"])
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    parser.add_argument("--max-queue-depth", type=int, default=256, help="requests beyond this get a 429")
+    parser.add_argument("--precision", default="fp32")
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--top-k", type=int, default=1, help="labels returned per input")
+    args = parser.parse_args(argv)
+
+    model_classes = {"text": TextClassifier, "image": ImageClassifier}
+    schedulers = {kind: BatchScheduler(model_classes[kind](precision=args.precision, backend=args.backend,
+                                                           top_k=args.top_k),
+                                       args.max_batch_size, args.max_wait_ms, args.max_queue_depth)
+                  for kind in args.models}
+    server = InferenceServer((args.host, args.port), schedulers)
+    # accept health checks immediately; /readyz flips to 200 once every model has loaded
+    threading.Thread(target=server.load_models, daemon=True).start()
+    print(f"Serving {', '.join(args.models)} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for scheduler in schedulers.values():
+            scheduler.close()
+
+if __name__ == "__main__":
+    main()
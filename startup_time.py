@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+def import_times(module):
+    # python -X importtime writes one "self | cumulative | name" line per import to stderr
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    times = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        times.append((int(cumulative_us), int(self_us), name.strip()))
+    return times
+
+def report(module, top=10):
+    times = import_times(module)
+    total = next((cumulative for cumulative, _, name in times if name == module), 0)
+    print(f"{module}: {total / 1000:.1f} ms to import")
+    for cumulative, _, name in sorted(times, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:9.1f} ms  {name}")
+    return total
+
+if __name__ == "__main__":
+    for module in sys.argv[1:] or ["final_with_oop_main", "gui", "models"]:
+        report(module)
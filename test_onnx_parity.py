@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("torch")
+
+import bench
+from models import TextClassifier, ImageClassifier
+from onnx_backend import check_parity
+from registry import ModelRegistry
+
+def test_text_parity():
+    mismatches = check_parity(TextClassifier, bench.text_corpus(16), model_name=bench.TINY_TEXT_MODEL,
+                              registry=ModelRegistry())
+    assert not mismatches, mismatches
+
+def test_text_predict_parity():
+    # predict() runs the pipeline stages itself, so it needs its own check against predict_batch()
+    mismatches = check_parity(TextClassifier, bench.text_corpus(8), single=True, top_k=2,
+                              model_name=bench.TINY_TEXT_MODEL, registry=ModelRegistry())
+    assert not mismatches, mismatches
+    model = TextClassifier(model_name=bench.TINY_TEXT_MODEL, top_k=2, registry=ModelRegistry())
+    corpus = bench.text_corpus(8)
+    for single, batched in zip((model.predict(text) for text in corpus), model.predict_batch(corpus)):
+        assert list(single.scores) == sorted(single.scores, reverse=True)
+        assert single.score == pytest.approx(batched.score, abs=1e-4)
+        assert single.label == batched.label or single.scores[0] - single.scores[1] <= 1e-4
+
+def test_image_parity():
+    mismatches = check_parity(ImageClassifier, bench.image_corpus(4, side=64), model_name=bench.TINY_IMAGE_MODEL,
+                              registry=ModelRegistry())
+    assert not mismatches, mismatches
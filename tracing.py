@@ -0,0 +1,45 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+class Trace:
+    """Per-request timeline of named stages, exportable as Chrome trace events."""
+
+    def __init__(self, name):
+        self.name = name
+        self.start_ns = time.perf_counter_ns()
+        self.thread_id = threading.get_ident()
+        self.spans = []
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.spans.append((stage, start, time.perf_counter_ns() - start))
+
+    def total_ns(self):
+        return sum(duration for _, _, duration in self.spans)
+
+    def summary(self):
+        total = self.total_ns() or 1
+        lines = [f"Stage breakdown for {self.name}:"]
+        for stage, _, duration in self.spans:
+            lines.append(f"  {stage:<12} {duration / 1e6:8.2f} ms  {duration / total:6.1%}")
+        lines.append(f"  {'total':<12} {self.total_ns() / 1e6:8.2f} ms")
+        return "\n".join(lines)
+
+    def chrome_events(self):
+        # complete ("X") events; ts/dur are microseconds
+        return [{"name": stage, "cat": self.name, "ph": "X", "ts": start / 1000, "dur": duration / 1000,
+                 "pid": os.getpid(), "tid": self.thread_id}
+                for stage, start, duration in self.spans]
+
+def export_chrome_trace(traces, path):
+    events = [event for trace in traces for event in trace.chrome_events()]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
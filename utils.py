@@ -1,20 +1,43 @@
 import time
 import functools
+import os
+import metrics
+
+# the old per-call prints are still available for debugging, but off by default
+VERBOSE = os.environ.get("HIT137_VERBOSE", "0") != "0"
+
+def _model_name(args):
+    return getattr(args[0], 'model_name', 'unknown') if args else 'unknown'
 
 def measure_time(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        print(f"[TIMER] {func.__name__} took {end-start:.2f}s")
-        return result
+        if not metrics.ENABLED:
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            metrics.METRICS.record_time(_model_name(args), func.__name__, elapsed)
+            if VERBOSE:
+                print(f"[TIMER] {func.__name__} took {elapsed / 1e9:.2f}s")
     return wrapper
 
 def log_call(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        model_name = getattr(args[0], 'model_name', 'unknown') if args else 'unknown'
-        print(f"[LOG] Calling {func.__name__} on {model_name}")
-        return func(*args, **kwargs)
+        if not metrics.ENABLED:
+            return func(*args, **kwargs)
+        model_name = _model_name(args)
+        if VERBOSE:
+            print(f"[LOG] Calling {func.__name__} on {model_name}")
+        metrics.METRICS.call_started(model_name, func.__name__)
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            metrics.METRICS.call_finished(model_name, func.__name__, failed)
     return wrapper
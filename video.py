@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import sys
+from models import ImageClassifier
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+def video_frames(path, stride=1):
+    """Yields (index, seconds, RGB uint8 array) for every stride-th frame of a video file.
+
+    Skipped frames are only grabbed, never decoded into pixels.
+    """
+    try:
+        import cv2
+    except ImportError:
+        raise RuntimeError("Video files need OpenCV: pip install opencv-python-headless") from None
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise OSError(f"Cannot open video {path}")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+    index = 0
+    try:
+        while capture.grab():
+            if index % stride == 0:
+                ok, frame = capture.retrieve()
+                if not ok:
+                    break
+                yield index, index / fps, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            index += 1
+    finally:
+        capture.release()
+
+def sequence_frames(folder, stride=1, fps=1.0):
+    """Yields (index, seconds, PIL image) for every stride-th image of a sorted directory listing."""
+    from PIL import Image
+    names = sorted(name for name in os.listdir(folder) if name.lower().endswith(IMAGE_EXTENSIONS))
+    for index in range(0, len(names), stride):
+        with Image.open(os.path.join(folder, names[index])) as image:
+            yield index, index / fps, image.convert("RGB")
+
+def dhash(frame, size=8):
+    """64-bit difference hash: near-identical frames differ in only a few bits."""
+    from PIL import Image
+    image = frame if hasattr(frame, "mode") else Image.fromarray(frame)
+    pixels = list(image.convert("L").resize((size + 1, size), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            value = (value << 1) | (left > pixels[row * (size + 1) + col + 1])
+    return value
+
+def distinct_frames(frames, threshold=5, stats=None):
+    """Drops frames whose hash is within `threshold` bits of the last frame that was kept.
+
+    Yields (index, seconds, frame, end_index, end_seconds), where the end marks
+    the last duplicate the kept frame stands in for.
+    """
+    last = None
+    kept = None
+    for index, seconds, frame in frames:
+        fingerprint = dhash(frame)
+        if stats is not None:
+            stats["sampled"] += 1
+        if last is not None and bin(fingerprint ^ last).count("1") <= threshold:
+            kept[3], kept[4] = index, seconds
+            continue
+        if kept is not None:
+            yield tuple(kept)
+        last = fingerprint
+        kept = [index, seconds, frame, index, seconds]
+    if kept is not None:
+        yield tuple(kept)
+
+def classify_frames(model, frames, batch_size=16, threshold=5):
+    """Runs surviving frames through model in batches and returns (timeline, stats).
+
+    The timeline merges consecutive kept frames with the same label into
+    segments; skipped duplicates extend the segment of the frame they matched.
+    """
+    stats = {"sampled": 0, "classified": 0}
+    segments = []
+    batch = []
+
+    def flush():
+        results = model.predict_batch([item[2] for item in batch], batch_size=batch_size)
+        stats["classified"] += len(batch)
+        for (index, seconds, _, end_index, end_seconds), result in zip(batch, results):
+            current = segments[-1] if segments else None
+            if current is not None and current["label"] == result.label:
+                current["end"] = end_seconds
+                current["end_frame"] = end_index
+                current["frames"] += 1
+                current["score"] += (result.score - current["score"]) / current["frames"]
+            else:
+                segments.append({"label": result.label, "start": seconds, "end": end_seconds,
+                                 "start_frame": index, "end_frame": end_index, "frames": 1,
+                                 "score": result.score})
+        batch.clear()
+
+    for item in distinct_frames(frames, threshold, stats):
+        batch.append(item)
+        if len(batch) == batch_size:
+            flush()
+    if batch:
+        flush()
+    stats["skipped_duplicates"] = stats["sampled"] - stats["classified"]
+    return segments, stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Label timeline for a video file or image sequence.")
+    parser.add_argument("source", help="video file, or a directory of frames")
+    parser.add_argument("--stride", type=int, default=5, help="classify every Nth frame")
+    parser.add_argument("--threshold", type=int, default=5, help="max differing hash bits to count as duplicate")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--fps", type=float, default=1.0, help="frame rate of an image sequence")
+    parser.add_argument("--model-name", default=None)
+    parser.add_argument("--json", action="store_true", help="print the timeline as JSON")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        frames = sequence_frames(args.source, args.stride, args.fps)
+    else:
+        frames = video_frames(args.source, args.stride)
+    model = ImageClassifier(model_name=args.model_name) if args.model_name else ImageClassifier()
+    segments, stats = classify_frames(model, frames, args.batch_size, args.threshold)
+    if args.json:
+        print(json.dumps({"segments": segments, "stats": stats}, indent=2))
+        return 0
+    for segment in segments:
+        print(f"{segment['start']:8.2f}s - {segment['end']:8.2f}s  {segment['label']} "
+              f"({segment['score']:.2f}, {segment['frames']} frames)")
+    print(f"{stats['sampled']} sampled frames, {stats['skipped_duplicates']} near-duplicates skipped, "
+          f"{stats['classified']} classified")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())